@@ -17,6 +17,7 @@ sys.path.append(os.path.dirname(__file__))
 
 try:
     from secret_sharing import ShamirSecretSharing
+    from image_codec import pixels_to_int
 except ImportError as e:
     st.error(f"导入模块失败: {e}")
     st.stop()
@@ -707,15 +708,13 @@ def deep_diagnose_image_issue():
             final_pixels = (compressed_pixels + salt) % 128
             st.write(f"- 最终像素范围: {final_pixels.min()} - {final_pixels.max()}")
 
-            # 手动编码为整数
-            manual_secret = 0
-            for pixel in final_pixels.flatten():
-                manual_secret = (manual_secret << 8) | int(pixel)
+            # 手动编码为整数（与系统编码相同的每像素8位拼接）
+            manual_secret = pixels_to_int(final_pixels, 8)
 
             st.write(f"- 手动编码的秘密值: {manual_secret}")
 
             # 使用系统编码
-            system_secret = shamir.encode_image_secret(original_path)
+            system_secret, _, _ = shamir.encode_image_secret(original_path, pixel_bits=8)
             st.write(f"- 系统编码的秘密值: {system_secret}")
 
             # 比较两个编码结果
@@ -0,0 +1,214 @@
+"""紧凑的域元素向量：连续的定长大端字节数组，代替 Python int 列表
+
+每个元素占 element_size = ceil(模数位数/8) 字节（2048位模数约256字节，而一个 int 对象约300字节
+加上列表指针）。加法、数乘和加权线性组合把整个向量打包成一个大整数（每个元素占一条带保护位的
+"车道"），由底层大整数运算一次完成，最后逐车道取模。梅森素数模数的取模同样在整个打包整数上
+按车道折叠完成，不逐元素转换为 int；一般大模数的车道取模本身就是大整数除法，逐车道进行，
+此时 FieldVector 的收益主要是内存（速度与 int 列表相当）。取单个元素时才转换为 int。
+字节布局与份额向量的认证消息相同，tobytes() 可直接用于签名、MAC和份额存储。
+"""
+import functools
+import numbers
+import numpy as np
+
+
+class FieldVector:
+    """模 modulus 的域元素向量，底层为 (长度, element_size) 的 uint8 数组"""
+    __slots__ = ("modulus", "element_size", "_data")
+
+    def __init__(self, data, modulus: int):
+        self.modulus = modulus
+        self.element_size = (modulus.bit_length() + 7) // 8
+        if not isinstance(data, np.ndarray):
+            data = np.frombuffer(data, dtype=np.uint8)
+        if data.ndim == 1:
+            if data.size % self.element_size:
+                raise ValueError("字节长度不是元素宽度的整数倍")
+            data = data.reshape(-1, self.element_size)
+        if data.dtype != np.uint8 or data.shape[1] != self.element_size:
+            raise ValueError("底层数组形状与模数不匹配")
+        self._data = data
+
+    @classmethod
+    def from_ints(cls, values, modulus: int):
+        """由整数序列构造（先对模数取模）"""
+        size = (modulus.bit_length() + 7) // 8
+        return cls(b"".join([(int(v) % modulus).to_bytes(size, "big") for v in values]), modulus)
+
+    @classmethod
+    def frombuffer(cls, buffer, modulus: int):
+        """零拷贝地包装定长编码的字节缓冲区（如内存映射的份额文件），不检查元素范围"""
+        return cls(np.frombuffer(buffer, dtype=np.uint8), modulus)
+
+    @classmethod
+    def zeros(cls, length: int, modulus: int):
+        return cls(np.zeros((length, (modulus.bit_length() + 7) // 8), dtype=np.uint8), modulus)
+
+    def to_ints(self) -> list:
+        raw = self.tobytes()
+        size = self.element_size
+        return [int.from_bytes(raw[i:i + size], "big") for i in range(0, len(raw), size)]
+
+    def tobytes(self) -> bytes:
+        return self._data.tobytes()
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FieldVector(self._data[index], self.modulus)
+        return int.from_bytes(self._data[index].tobytes(), "big")
+
+    def __iter__(self):
+        size = self.element_size
+        raw = self.tobytes()
+        for i in range(0, len(raw), size):
+            yield int.from_bytes(raw[i:i + size], "big")
+
+    def __eq__(self, other):
+        if isinstance(other, FieldVector):
+            return self.modulus == other.modulus and np.array_equal(self._data, other._data)
+        if isinstance(other, (list, tuple)):
+            return self.to_ints() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FieldVector(len={len(self)}, modulus_bits={self.modulus.bit_length()})"
+
+    def in_range(self) -> bool:
+        """所有元素是否都小于模数（按大端字节逐行比较）"""
+        if not len(self):
+            return True
+        bound = np.frombuffer(self.modulus.to_bytes(self.element_size, "big"), dtype=np.uint8)
+        differ = self._data != bound
+        first = differ.argmax(axis=1)
+        below = self._data[np.arange(len(self)), first] < bound[first]
+        return bool((differ.any(axis=1) & below).all())
+
+    # ------------------------------------------------------------------
+    # 车道打包运算
+    # ------------------------------------------------------------------
+
+    def _pack(self, lane_size: int) -> int:
+        """把向量打包为大整数：每个元素左侧补零到 lane_size 字节"""
+        padded = np.zeros((len(self), lane_size), dtype=np.uint8)
+        padded[:, lane_size - self.element_size:] = self._data
+        return int.from_bytes(padded.tobytes(), "big")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _lane_mask(length: int, lane_size: int, bits: int) -> int:
+        """每条车道低 bits 位为1的掩码（同一批线性组合的各行共用，缓存最近几个）"""
+        lane = np.frombuffer(((1 << bits) - 1).to_bytes(lane_size, "big"), dtype=np.uint8)
+        return int.from_bytes(np.tile(lane, length).tobytes(), "big")
+
+    @classmethod
+    def _unpack(cls, value: int, length: int, lane_size: int, modulus: int):
+        """逐车道取模并重新编码为 FieldVector"""
+        size = (modulus.bit_length() + 7) // 8
+        if modulus & (modulus + 1) == 0:
+            lanes = cls._fold_mersenne(value, length, lane_size, modulus)
+            return cls(np.ascontiguousarray(lanes[:, lane_size - size:]), modulus)
+        # 一般模数：车道内取模本身就是大整数除法，逐车道进行与逐元素运算的代价相当
+        raw = value.to_bytes(length * lane_size, "big")
+        return cls(b"".join([(int.from_bytes(raw[i:i + lane_size], "big") % modulus).to_bytes(size, "big")
+                             for i in range(0, len(raw), lane_size)]), modulus)
+
+    @classmethod
+    def _fold_mersenne(cls, value: int, length: int, lane_size: int, modulus: int) -> np.ndarray:
+        """梅森素数 2^k-1：x ≡ (x & (2^k-1)) + (x >> k)，对整个打包整数按车道折叠，
+        只用移位、按位与和加法，不逐元素转换；返回 (length, lane_size) 的已约简车道"""
+        k = modulus.bit_length()
+        bits = 8 * lane_size
+        low = cls._lane_mask(length, lane_size, k)
+        while bits > k:
+            value = (value & low) + ((value >> k) & cls._lane_mask(length, lane_size, bits - k))
+            bits = max(k, bits - k) + 1
+            if bits == k + 1:
+                # 车道值 < 2^(k+1)，再折叠一次后不超过 2^k，即 p+1
+                value = (value & low) + ((value >> k) & cls._lane_mask(length, lane_size, 1))
+                break
+        lanes = np.frombuffer(value.to_bytes(length * lane_size, "big"), dtype=np.uint8).reshape(length, lane_size)
+        bound = np.frombuffer(modulus.to_bytes(lane_size, "big"), dtype=np.uint8)
+        differ = lanes != bound
+        first = differ.argmax(axis=1)
+        over = ~differ.any(axis=1) | (lanes[np.arange(length), first] > bound[first])
+        if over.any():
+            # 等于 p 或 p+1 的车道再减去一个 p = 2^k - 1
+            counts = np.zeros((length, lane_size), dtype=np.uint8)
+            counts[:, -1] = over
+            count = int.from_bytes(counts.tobytes(), "big")
+            value -= (count << k) - count
+            lanes = np.frombuffer(value.to_bytes(length * lane_size, "big"), dtype=np.uint8).reshape(length, lane_size)
+        return lanes
+
+    def _lane_size(self, terms: int) -> int:
+        """容纳 terms 个 (模数-1)^2 之和而不跨车道进位的车道字节数"""
+        return (2 * self.modulus.bit_length() + terms.bit_length() + 7) // 8
+
+    def _check_compatible(self, other):
+        if not isinstance(other, FieldVector):
+            raise TypeError("只能与 FieldVector 运算")
+        if other.modulus != self.modulus:
+            raise ValueError("两个向量的模数不同")
+        if len(other) != len(self):
+            raise ValueError("两个向量长度不同")
+
+    def __add__(self, other):
+        if not isinstance(other, FieldVector):
+            return NotImplemented
+        return self.linear_combination([self, other], [1, 1])
+
+    def __sub__(self, other):
+        if not isinstance(other, FieldVector):
+            return NotImplemented
+        return self.linear_combination([self, other], [1, self.modulus - 1])
+
+    def scale(self, k: int):
+        """数乘：每个元素乘以 k (mod modulus)"""
+        return self.linear_combination([self], [k])
+
+    def __mul__(self, k):
+        if not isinstance(k, numbers.Integral):
+            return NotImplemented
+        return self.scale(int(k))
+
+    __rmul__ = __mul__
+
+    def dot(self, weights) -> int:
+        """与权重向量的内积 Σ w_j·v_j (mod modulus)"""
+        weights = list(weights)
+        if len(weights) != len(self):
+            raise ValueError("权重个数与向量长度不同")
+        return sum(w * v for w, v in zip(weights, self)) % self.modulus
+
+    @staticmethod
+    def linear_combination(vectors: list, weights: list):
+        """Σ w_i·V_i (mod modulus)：每个向量打包成一个大整数后整体相乘累加"""
+        return FieldVector.linear_combinations(vectors, [weights])[0]
+
+    @staticmethod
+    def linear_combinations(vectors: list, weight_rows: list) -> list:
+        """对每行权重求一次线性组合，向量只打包一次（如一次求出所有参与方的份额向量）"""
+        if not vectors or any(len(weights) != len(vectors) for weights in weight_rows):
+            raise ValueError("向量与权重个数必须相同且不为空")
+        first = vectors[0]
+        for vector in vectors[1:]:
+            first._check_compatible(vector)
+        modulus = first.modulus
+        lane_size = first._lane_size(len(vectors))
+        packed = [vector._pack(lane_size) for vector in vectors]
+        result = []
+        for weights in weight_rows:
+            acc = 0
+            for value, w in zip(packed, weights):
+                w = int(w) % modulus
+                if w:
+                    acc += w * value
+            result.append(FieldVector._unpack(acc, len(first), lane_size, modulus))
+        return result
@@ -25,9 +25,9 @@ class FederatedLearningWithSecretSharing:
         # 分割秘密并添加签名/MAC
         return self.shamir.split_secret(secret)
 
-    @staticmethod
-    def server_aggregate(self,shares_list: list) -> int:
-        """服务器聚合份额并重构秘密"""
+    def server_aggregate(self, shares_list: list) -> int:
+        """服务器聚合份额并重构秘密（reconstruct_secret 按代价顺序过滤无效份额，
+        配置了验签池时分批并行验签，凑够t个有效份额即停止）"""
         all_shares = [share for client_shares in shares_list for share in client_shares]
         return self.shamir.reconstruct_secret(all_shares)
 
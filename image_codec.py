@@ -0,0 +1,44 @@
+"""像素数组与大整数之间的线性时间转换
+
+旧实现逐像素执行 secret = (secret << 8) | pixel，每次移位都复制不断变长的大整数，整体是 O(N^2)。
+这里先把像素按 bits 位一段紧密拼成字节串（NumPy unpackbits/packbits），再用一次 int.from_bytes /
+to_bytes 完成转换。第一个像素位于最高位，bits=8 时结果与旧的逐像素移位完全相同；
+压缩到 0-127 的像素用 bits=7 可节省 1/8 的位数。
+"""
+import numpy as np
+
+
+def _check_bits(bits: int):
+    if not 1 <= bits <= 8:
+        raise ValueError("每像素位数必须在 1 到 8 之间")
+
+
+def pixels_to_int(pixels, bits: int = 8) -> int:
+    """把像素序列（每个值小于 2^bits）按大端顺序紧密拼接为一个整数"""
+    _check_bits(bits)
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8).reshape(-1)
+    if bits == 8:
+        return int.from_bytes(pixels.tobytes(), "big")
+    if pixels.size and int(pixels.max()) >> bits:
+        raise ValueError(f"像素值超出 {bits} 位")
+    # 每个像素取低 bits 位；在最前面补0使总位数为8的整数倍，保证整数值与逐像素移位一致
+    stream = np.unpackbits(pixels.reshape(-1, 1), axis=1)[:, 8 - bits:].reshape(-1)
+    pad = -stream.size % 8
+    if pad:
+        stream = np.concatenate([np.zeros(pad, dtype=np.uint8), stream])
+    return int.from_bytes(np.packbits(stream).tobytes(), "big")
+
+
+def int_to_pixels(value: int, count: int, bits: int = 8) -> np.ndarray:
+    """pixels_to_int 的逆过程，返回长度为 count 的 uint8 数组；超出 count 个像素的高位被忽略"""
+    _check_bits(bits)
+    total_bits = count * bits
+    length = (total_bits + 7) // 8
+    value &= (1 << total_bits) - 1
+    raw = np.frombuffer(value.to_bytes(length, "big"), dtype=np.uint8)
+    if bits == 8:
+        return raw.copy()
+    stream = np.unpackbits(raw)[length * 8 - total_bits:].reshape(count, bits)
+    padded = np.zeros((count, 8), dtype=np.uint8)
+    padded[:, 8 - bits:] = stream
+    return np.packbits(padded, axis=1).reshape(-1)
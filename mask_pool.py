@@ -0,0 +1,108 @@
+"""离线/在线分割：预先计算常数项为0的随机多项式在 x=1..n 处的取值（掩码份额）
+
+多项式的随机部分与秘密无关，可以在空闲时批量生成；在线分割时只需把秘密加到每个掩码份额上，
+f(x) = secret + r(x)，r(0) = 0。每个掩码只使用一次，取出后即从池中删除。
+"""
+import threading
+from collections import deque
+
+
+class MaskPool:
+    """掩码份额池：capacity 为池容量，可用数量低于 low_watermark 时后台线程补充到满"""
+
+    def __init__(self, shamir, capacity: int = 1024, low_watermark: int = None, batch_size: int = 256,
+                 background: bool = True):
+        if capacity < 1:
+            raise ValueError("掩码池容量必须为正整数")
+        self.shamir = shamir
+        self.capacity = capacity
+        self.low_watermark = capacity // 2 if low_watermark is None else low_watermark
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.refills = 0
+        self._masks = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        if background:
+            self.start()
+
+    def generate(self, count: int) -> list:
+        """批量生成 count 个掩码，每个掩码是长度为n的列表（第i项为 r(i+1)）"""
+        shamir = self.shamir
+        degree = shamir.t - 1
+        flat = shamir.random_source.field_elements(shamir.modulus, degree * count)
+        coefficients = [flat[j * count:(j + 1) * count] for j in range(degree)]
+        columns = shamir._evaluate_shares([0] * count, coefficients)
+        return [list(mask) for mask in zip(*columns)]
+
+    def fill(self) -> int:
+        """同步补充到容量上限，返回新增数量"""
+        added = 0
+        while True:
+            with self._condition:
+                missing = self.capacity - len(self._masks)
+            if missing <= 0:
+                return added
+            masks = self.generate(min(missing, self.batch_size))
+            with self._condition:
+                self._masks.extend(masks)
+                self.generated += len(masks)
+            added += len(masks)
+
+    def take(self) -> list:
+        """取出一个掩码；池为空时计入一次耗尽并现场生成"""
+        with self._condition:
+            if self._masks:
+                mask = self._masks.popleft()
+                self.hits += 1
+            else:
+                mask = None
+                self.misses += 1
+            if len(self._masks) < self.low_watermark:
+                self._condition.notify()
+        if mask is None:
+            mask = self.generate(1)[0]
+            with self._condition:
+                self.generated += 1
+        return mask
+
+    def start(self):
+        """启动后台补充线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="mask-pool-refill", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and len(self._masks) >= self.low_watermark:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                self.refills += 1
+            self.fill()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._masks)
+
+    def stats(self) -> dict:
+        """命中/耗尽次数与库存；exhaustion_rate 为取掩码时池为空的比例"""
+        with self._condition:
+            requests = self.hits + self.misses
+            return {"capacity": self.capacity, "available": len(self._masks), "hits": self.hits,
+                    "misses": self.misses, "generated": self.generated, "refills": self.refills,
+                    "exhaustion_rate": self.misses / requests if requests else 0.0}
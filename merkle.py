@@ -0,0 +1,64 @@
+"""Merkle树批量认证：一次分割的所有份额只对根签名一次，每个份额携带包含证明"""
+from collections import namedtuple
+import hashlib
+
+# root: 树根; signature: 对树根的签名; index/count: 叶子位置与叶子总数; path: 自底向上的兄弟哈希
+MerkleProof = namedtuple("MerkleProof", ["root", "signature", "index", "count", "path"])
+
+
+def leaf_hash(data: bytes) -> bytes:
+    """叶子哈希（加 0x00 前缀，与内部节点区分，防止第二原像攻击）"""
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+class MerkleTree:
+    """二叉Merkle树；奇数个节点时最后一个节点直接晋升到上一层"""
+
+    def __init__(self, leaves: list):
+        if not leaves:
+            raise ValueError("Merkle树至少需要一个叶子")
+        self.count = len(leaves)
+        self.levels = [[leaf_hash(leaf) for leaf in leaves]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parent = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parent.append(level[-1])
+            self.levels.append(parent)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def path(self, index: int) -> list:
+        """第 index 个叶子的包含证明（兄弟哈希列表，晋升层不产生条目）"""
+        path = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(level[sibling])
+            index //= 2
+        return path
+
+
+def verify_path(leaf: bytes, index: int, count: int, path: list, root: bytes) -> bool:
+    """根据包含证明重算树根并与 root 比较"""
+    if not 0 <= index < count:
+        return False
+    node = leaf_hash(leaf)
+    width = count
+    steps = iter(path)
+    try:
+        while width > 1:
+            if index ^ 1 < width:
+                sibling = next(steps)
+                node = node_hash(sibling, node) if index % 2 else node_hash(node, sibling)
+            index //= 2
+            width = (width + 1) // 2
+    except StopIteration:
+        return False
+    return next(steps, None) is None and node == root
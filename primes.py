@@ -0,0 +1,258 @@
+"""预置素数注册表与素数生成：常用位长的已验证素数，避免每个实例重新生成大素数"""
+import json
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# RFC 3526 MODP 群素数（安全素数，p 与 (p-1)/2 均为素数）
+_MODP_1536 = int(
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD1"
+    "29024E088A67CC74020BBEA63B139B22514A08798E3404DD"
+    "EF9519B3CD3A431B302B0A6DF25F14374FE1356D6D51C245"
+    "E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+    "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3D"
+    "C2007CB8A163BF0598DA48361C55D39A69163FA8FD24CF5F"
+    "83655D23DCA3AD961C62F356208552BB9ED529077096966D"
+    "670C354E4ABC9804F1746C08CA237327FFFFFFFFFFFFFFFF", 16)
+
+_MODP_2048 = int(
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD1"
+    "29024E088A67CC74020BBEA63B139B22514A08798E3404DD"
+    "EF9519B3CD3A431B302B0A6DF25F14374FE1356D6D51C245"
+    "E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+    "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3D"
+    "C2007CB8A163BF0598DA48361C55D39A69163FA8FD24CF5F"
+    "83655D23DCA3AD961C62F356208552BB9ED529077096966D"
+    "670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+    "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9"
+    "DE2BCBF6955817183995497CEA956AE515D2261898FA0510"
+    "15728E5A8AACAA68FFFFFFFFFFFFFFFF", 16)
+
+STANDARD_PRIMES = {
+    "gf257": 257,
+    "mersenne31": 2 ** 31 - 1,
+    "mersenne61": 2 ** 61 - 1,
+    "mersenne89": 2 ** 89 - 1,
+    "mersenne107": 2 ** 107 - 1,
+    "mersenne127": 2 ** 127 - 1,
+    "p256": 2 ** 256 - 2 ** 224 + 2 ** 192 + 2 ** 96 - 1,  # NIST P-256 基域素数
+    "mersenne521": 2 ** 521 - 1,
+    "modp1536": _MODP_1536,
+    "modp2048": _MODP_2048,
+}
+
+DEFAULT_PRIME = "modp2048"
+
+
+def get_standard_prime(key) -> int:
+    """按名称（如 "mersenne127"）或位长（如 127）获取预置素数"""
+    if isinstance(key, str):
+        if key not in STANDARD_PRIMES:
+            raise ValueError(f"未知的预置素数: {key}，可选: {', '.join(STANDARD_PRIMES)}")
+        return STANDARD_PRIMES[key]
+    for prime in STANDARD_PRIMES.values():
+        if prime.bit_length() == key:
+            return prime
+    available = ", ".join(str(p.bit_length()) for p in STANDARD_PRIMES.values())
+    raise ValueError(f"没有 {key} 位的预置素数，可选位长: {available}")
+
+
+# 域选择时在载荷之上保留的余量位数：秘密（及多方求和、加噪后的结果）至少比模数小 2^40 倍
+DEFAULT_MARGIN_BITS = 40
+
+
+def select_standard_prime(payload_bits: int, margin_bits: int = DEFAULT_MARGIN_BITS, min_value: int = 0):
+    """返回能容纳 payload_bits + margin_bits 位整数且大于 min_value 的最小预置素数名称；
+    没有足够大的预置素数时返回 None"""
+    needed = payload_bits + margin_bits
+    candidates = [(prime, name) for name, prime in STANDARD_PRIMES.items()
+                  if prime.bit_length() - 1 >= needed and prime > min_value]
+    return min(candidates)[1] if candidates else None
+
+
+def list_standard_primes() -> dict:
+    """返回 {名称: 位长}"""
+    return {name: prime.bit_length() for name, prime in STANDARD_PRIMES.items()}
+
+
+# ---------------------------------------------------------------------------
+# 素数生成流水线：小素数筛 -> 进程池并行 Miller-Rabin -> 可选磁盘缓存
+# ---------------------------------------------------------------------------
+
+SIEVE_LIMIT = 1 << 16
+SIEVE_WINDOW = 4096
+
+
+def _small_primes(limit: int) -> list:
+    """埃氏筛生成小于 limit 的素数表"""
+    flags = bytearray([1]) * limit
+    flags[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if flags[i]]
+
+
+SMALL_PRIMES = _small_primes(SIEVE_LIMIT)
+
+
+def is_probable_prime(n: int, k: int = 40) -> bool:
+    """Miller-Rabin素性测试（先用小素数试除）"""
+    if n < 2:
+        return False
+    for q in SMALL_PRIMES[:64]:
+        if n % q == 0:
+            return n == q
+    r, d = 0, n - 1
+    while d % 2 == 0:
+        r += 1
+        d //= 2
+    for _ in range(k):
+        a = secrets.randbelow(n - 3) + 2
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _sieve_window(start: int, window: int, safe: bool) -> list:
+    """返回 start + 2i (0 <= i < window) 中未被小素数整除的候选；
+    safe=True 时同时要求 2(start + 2i) + 1 不被小素数整除"""
+    composite = bytearray(window)
+    for q in SMALL_PRIMES[1:]:
+        # start + 2i ≡ 0 (mod q)；候选恰好等于 q 时它本身是素数，从下一个倍数开始标记
+        i0 = (-start * ((q + 1) // 2)) % q
+        if start + 2 * i0 == q:
+            i0 += q
+        composite[i0::q] = b"\x01" * len(range(i0, window, q))
+        if safe:
+            # 2(start + 2i) + 1 ≡ 0 (mod q)
+            i1 = (-(2 * start + 1) * pow(4, -1, q)) % q
+            if 2 * (start + 2 * i1) + 1 == q:
+                i1 += q
+            composite[i1::q] = b"\x01" * len(range(i1, window, q))
+    return [start + 2 * i for i in range(window) if not composite[i]]
+
+
+def _test_candidate(candidate: int, safe: bool, rounds: int):
+    """进程池任务：通过测试时返回素数（safe 模式返回 2q+1），否则返回 None"""
+    if safe:
+        # 先对 p = 2q+1 做一轮以2为底的费马测试，快速排除
+        p = 2 * candidate + 1
+        if pow(2, p - 1, p) != 1:
+            return None
+        if is_probable_prime(candidate, rounds) and is_probable_prime(p, rounds):
+            return p
+        return None
+    return candidate if is_probable_prime(candidate, rounds) else None
+
+
+def _test_candidates(candidates: list, safe: bool, rounds: int):
+    """进程池任务：按顺序测试一批候选，返回第一个素数；一次 IPC 摊销到整批候选上"""
+    for candidate in candidates:
+        prime = _test_candidate(candidate, safe, rounds)
+        if prime is not None:
+            return prime
+    return None
+
+
+def _random_window_start(bit_length: int, safe: bool) -> int:
+    """随机选择奇数起点，保证窗口内候选（safe 模式下为 2q+1）恰为 bit_length 位"""
+    bits = bit_length - 1 if safe else bit_length
+    start = secrets.randbits(bits) | (1 << (bits - 1)) | (1 << (bits - 2)) | 1
+    limit = (1 << bits) - 2 * SIEVE_WINDOW
+    return start if start < limit else start - 2 * SIEVE_WINDOW
+
+
+def _rounds_for_size(bit_length: int) -> int:
+    """随机候选数达到 2^-80 错误率所需的 Miller-Rabin 轮数（同 OpenSSL BN_prime_checks_for_size）"""
+    for bits, rounds in ((3747, 3), (1345, 4), (476, 5), (400, 6), (347, 7), (308, 8), (55, 27)):
+        if bit_length >= bits:
+            return rounds
+    return 34
+
+
+def generate_prime(bit_length: int = 2048, safe: bool = False, workers: int = None,
+                   rounds: int = None, cache_path: str = None, executor=None) -> int:
+    """生成 bit_length 位（安全）素数
+
+    先用小素数表筛掉绝大多数合数，再把幸存候选按工作进程数交错分成几批，每批作为一个任务
+    分发到进程池做 Miller-Rabin；rounds 默认按位长取随机候选数所需的轮数。
+    executor 可传入长期存在的 concurrent.futures 执行器（由调用方负责关闭），避免每次调用都启动进程池；
+    否则 workers > 1 时临时创建一个。
+    指定 cache_path 时优先复用磁盘缓存中的素数，生成后写回缓存。
+    """
+    if bit_length < 16:
+        raise ValueError("素数位长至少为16")
+    if rounds is None:
+        rounds = _rounds_for_size(bit_length)
+    cache = PrimeCache(cache_path) if cache_path else None
+    if cache is not None:
+        cached = cache.get(bit_length, safe)
+        if cached is not None:
+            return cached
+
+    prime = None
+    owned = executor is None and workers is not None and workers > 1
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    if executor is not None and not workers:
+        workers = getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+    try:
+        while prime is None:
+            candidates = _sieve_window(_random_window_start(bit_length, safe), SIEVE_WINDOW, safe)
+            if executor is None:
+                prime = _test_candidates(candidates, safe, rounds)
+            else:
+                futures = [executor.submit(_test_candidates, candidates[i::workers], safe, rounds)
+                           for i in range(min(workers, len(candidates)))]
+                for future in as_completed(futures):
+                    prime = future.result()
+                    if prime is not None:
+                        break
+                for future in futures:
+                    future.cancel()
+    finally:
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if cache is not None:
+        cache.put(bit_length, safe, prime)
+    return prime
+
+
+class PrimeCache:
+    """以JSON持久化的素数缓存，键为 位长 + 是否安全素数"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _key(bit_length: int, safe: bool) -> str:
+        return f"{bit_length}{'-safe' if safe else ''}"
+
+    def get(self, bit_length: int, safe: bool = False):
+        entry = self._load().get(self._key(bit_length, safe))
+        return int(entry, 16) if entry else None
+
+    def put(self, bit_length: int, safe: bool, prime: int):
+        entries = self._load()
+        entries[self._key(bit_length, safe)] = format(prime, "x")
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_path, self.path)
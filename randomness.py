@@ -0,0 +1,179 @@
+"""批量随机数层：缓冲的系统CSPRNG或AES-CTR密钥流，按块拒绝采样出均匀的域元素
+
+random.randrange 既不是密码学安全的随机数，每个系数又要一次 Python 调用。这里一次读取一大块随机字节，
+按模数位长截断每个定长元素的最高字节，用 NumPy 比较每行的64位前缀，一次筛掉所有越界元素；
+不超过64位的模数整块转换为整数，更大的模数每个元素只需一次 int.from_bytes。
+AESCTRRandom 以32字节种子确定性地展开密钥流，可用于由种子重新生成份额。
+"""
+import os
+import threading
+import numpy as np
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.backends import default_backend
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+SEED_SIZE = 32
+
+class SeededVector:
+    """由种子展开的份额向量：seed 为 AES-CTR 种子，length 为展开后的元素个数。
+    len() 返回元素个数；不可迭代，需要元素时用 ShamirSecretSharing.expand_share 展开"""
+    __slots__ = ("seed", "length")
+
+    def __init__(self, seed: bytes, length: int):
+        self.seed = seed
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SeededVector):
+            return NotImplemented
+        return self.seed == other.seed and self.length == other.length
+
+    def __hash__(self) -> int:
+        return hash((self.seed, self.length))
+
+    def __repr__(self) -> str:
+        return f"SeededVector(seed={self.seed.hex()}, length={self.length})"
+
+
+class RandomSource:
+    """带缓冲的随机字节源；子类实现 _fill(n) 返回 n 个新随机字节"""
+    name = None
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._buffer = b""
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def _fill(self, n: int) -> bytes:
+        raise NotImplementedError
+
+    def read(self, n: int) -> bytes:
+        """读取 n 个随机字节；大块请求直接从底层生成，小块请求从缓冲区切出"""
+        with self._lock:
+            available = len(self._buffer) - self._position
+            if n > available:
+                if n - available >= self.buffer_size:
+                    head = self._buffer[self._position:]
+                    self._buffer, self._position = b"", 0
+                    return head + self._fill(n - available)
+                self._buffer = self._buffer[self._position:] + self._fill(self.buffer_size)
+                self._position = 0
+            data = self._buffer[self._position:self._position + n]
+            self._position += n
+            return data
+
+    def _accepted_rows(self, modulus: int, count: int) -> np.ndarray:
+        """拒绝采样：返回 (count, 元素字节数) 的大端 uint8 数组，每行都是 [0, modulus) 上的均匀元素。
+        先只比较每行的前（至多）8个字节，与模数前缀相等的极少数行才逐字节比较"""
+        size = (modulus.bit_length() + 7) // 8
+        top_mask = (1 << (modulus.bit_length() - 8 * (size - 1))) - 1
+        bound = np.frombuffer(modulus.to_bytes(size, "big"), dtype=np.uint8)
+        head = min(size, 8)
+        bound_head = modulus >> (8 * (size - head))
+        # 截断到模数位长后的接受率 p / 2^bits 不低于 1/2；按接受率多抽约 10%，减少循环次数
+        acceptance = modulus / (1 << modulus.bit_length())
+        accepted = []
+        remaining = count
+        while remaining > 0:
+            draw = int(remaining / acceptance * 1.1) + 8
+            rows = np.frombuffer(self.read(draw * size), dtype=np.uint8).reshape(draw, size)
+            prefix = np.zeros((draw, 8), dtype=np.uint8)
+            prefix[:, 8 - head:] = rows[:, :head]
+            prefix[:, 8 - head] &= top_mask
+            heads = prefix.view(">u8").reshape(-1)
+            below = heads < bound_head
+            ties = np.flatnonzero(heads == bound_head)
+            if ties.size and size > head:
+                tied = rows[ties].copy()
+                tied[:, 0] &= top_mask
+                differ = tied != bound
+                first = differ.argmax(axis=1)
+                below[ties] = differ.any(axis=1) & (tied[np.arange(ties.size), first] < bound[first])
+            rows = rows[below][:remaining]  # 布尔索引得到可写副本
+            rows[:, 0] &= top_mask
+            accepted.append(rows)
+            remaining -= rows.shape[0]
+        return np.concatenate(accepted) if len(accepted) > 1 else accepted[0]
+
+    def field_bytes(self, modulus: int, count: int) -> bytes:
+        """count 个均匀域元素的定长大端编码（可直接作为 FieldVector 的底层数组）"""
+        if count <= 0:
+            return b""
+        return self._accepted_rows(modulus, count).tobytes()
+
+    def field_elements(self, modulus: int, count: int) -> list:
+        """count 个 [0, modulus) 上的均匀整数；不超过64位的模数整块用 NumPy 转换"""
+        if modulus.bit_length() <= 64:
+            return self.field_array(modulus, (count,)).tolist()
+        raw = self.field_bytes(modulus, count)
+        size = (modulus.bit_length() + 7) // 8
+        return [int.from_bytes(raw[i:i + size], "big") for i in range(0, len(raw), size)]
+
+    def field_array(self, modulus: int, shape) -> np.ndarray:
+        """模数小于 2^64 时返回给定形状的 uint64 均匀元素数组"""
+        if modulus.bit_length() > 64:
+            raise ValueError("field_array 只支持小于 2^64 的模数")
+        count = int(np.prod(shape))
+        size = (modulus.bit_length() + 7) // 8
+        padded = np.zeros((count, 8), dtype=np.uint8)
+        if count:
+            padded[:, 8 - size:] = self._accepted_rows(modulus, count)
+        return padded.view(">u8").reshape(shape).astype(np.uint64)
+
+
+# 单次补充超过该字节数时，用 os.urandom 取一个新的 AES-256 密钥展开 CTR 密钥流（CTR_DRBG 式），
+# 每个密钥只用于一次补充；os.urandom 的带宽只有 AES-NI 的几分之一，大块系数生成时成为瓶颈
+SYSTEM_EXPAND_THRESHOLD = 1 << 12
+
+
+class SystemRandom(RandomSource):
+    """操作系统CSPRNG：小块直接读 os.urandom，大块由 os.urandom 新取的密钥经 AES-CTR 展开"""
+    name = "system"
+
+    def _fill(self, n: int) -> bytes:
+        if n <= SYSTEM_EXPAND_THRESHOLD:
+            return os.urandom(n)
+        cipher = Cipher(algorithms.AES(os.urandom(SEED_SIZE)), modes.CTR(b"\x00" * 16), backend=default_backend())
+        return cipher.encryptor().update(bytes(n))
+
+
+class AESCTRRandom(RandomSource):
+    """AES-256-CTR 密钥流PRG：同一种子总是展开出相同的字节序列"""
+    name = "aes-ctr"
+
+    def __init__(self, seed: bytes = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self.seed = os.urandom(SEED_SIZE) if seed is None else bytes(seed)
+        if len(self.seed) != SEED_SIZE:
+            raise ValueError(f"AES-CTR 种子必须为 {SEED_SIZE} 字节")
+        cipher = Cipher(algorithms.AES(self.seed), modes.CTR(b"\x00" * 16), backend=default_backend())
+        self._encryptor = cipher.encryptor()
+
+    def _fill(self, n: int) -> bytes:
+        return self._encryptor.update(bytes(n))
+
+
+RANDOM_SOURCES = {cls.name: cls for cls in (SystemRandom, AESCTRRandom)}
+
+
+def create_random_source(source=None) -> RandomSource:
+    """source 可以是 RandomSource 实例、"system"（默认）或 "aes-ctr"（随机种子）"""
+    if isinstance(source, RandomSource):
+        return source
+    name = source or "system"
+    if name not in RANDOM_SOURCES:
+        raise ValueError(f"未知的随机源: {name}，可选: {', '.join(RANDOM_SOURCES)}")
+    return RANDOM_SOURCES[name]()
+
+
+def expand_seed(seed: bytes, modulus: int, length: int, as_array: bool = False):
+    """把种子确定性地展开为 length 个 [0, modulus) 上的均匀元素；as_array=True 时返回 uint64 数组
+    （两种形式的取值相同）"""
+    source = AESCTRRandom(seed)
+    if as_array:
+        return source.field_array(modulus, (length,))
+    return source.field_elements(modulus, length)
@@ -1,63 +1,278 @@
+import hashlib
+import hmac
+import json
 import random
 import math
-import secrets
+import numbers
+import operator
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding as rsa_padding
 from cryptography.hazmat.backends import default_backend
 from PIL import Image
 import numpy as np
+from merkle import MerkleProof, MerkleTree, verify_path
+from primes import (DEFAULT_MARGIN_BITS, DEFAULT_PRIME, STANDARD_PRIMES, generate_prime, get_standard_prime,
+                    is_probable_prime, select_standard_prime)
+from field_vector import FieldVector
+from image_codec import int_to_pixels, pixels_to_int
+from mask_pool import MaskPool
+from randomness import SEED_SIZE, SeededVector, create_random_source, expand_seed
+import small_field
+from share_codec import decode_batch, encode_batch
+from signers import DEFAULT_SIGNER, create_signer, signer_for_private_key, signer_for_public_key, verify_batch
+
+
+class LagrangeCache:
+    """按 (模数, 参与方x集合) 缓存 λ_i(0) 的LRU缓存"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, modulus: int, xs, compute: callable) -> dict:
+        """返回 {x: λ_x(0)}，未命中时调用 compute(xs) 计算并写入缓存"""
+        key = (modulus, frozenset(xs))
+        with self._lock:
+            weights = self._entries.get(key)
+            if weights is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return weights
+            self.misses += 1
+        ordered = sorted(key[1])
+        weights = dict(zip(ordered, compute(ordered)))
+        with self._lock:
+            self._entries[key] = weights
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return weights
+
+    def info(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._entries), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+MAC_ALGORITHMS = ("sha256", "hmac-sha256", "blake2b")
 
 
 class ShamirSecretSharing:
-    def __init__(self, threshold: int, num_parties: int, modulus: int = None):
+    lagrange_cache = LagrangeCache()
+    DIFFERENCE_MIN_PARTIES = 1000
+
+    def __init__(self, threshold: int, num_parties: int, modulus=None, prime_bits: int = None,
+                 generate_prime: bool = False, private_key=None, public_key=None,
+                 auth_mode: str = "signature", signature_backend: str = DEFAULT_SIGNER,
+                 mac_algorithm: str = "sha256", mac_key: bytes = None,
+                 verify_workers: int = None, verify_executor: str = "thread",
+                 margin_bits: int = DEFAULT_MARGIN_BITS, random_source=None, payload_bits: int = None):
+        """modulus 可以是素数本身或预置素数名称；未指定时按 prime_bits 从注册表选取，
+        默认使用 RFC 3526 的2048位安全素数。只有 generate_prime=True 时才现场生成新素数。
+
+        private_key / public_key 可传入密钥对象或 PEM/DER 字节；都未提供时，
+        签名密钥在第一次签名时才生成。只提供公钥的实例只能验证、不能签名。
+
+        auth_mode="signature" 时逐份额签名；"merkle" 时一次分割的所有份额组成Merkle树，
+        只对树根签名一次，每个份额的签名字段为携带包含证明的 MerkleProof。
+
+        signature_backend 可选 "ed25519"（默认）、"ecdsa"（P-256）或 "rsa"（兼容旧版份额）。
+
+        mac_algorithm="sha256" 为旧版无密钥摘要；"hmac-sha256" / "blake2b" 为带密钥MAC，
+        每个参与方的MAC密钥由主密钥 mac_key（未提供时随机生成）派生。
+        auth_mode="mac" 时完全不签名，只依赖带密钥MAC，适用于可信聚合方部署。
+
+        verify_workers > 1 时签名验证分发到 concurrent.futures 池并行执行：
+        verify_executor="thread"（OpenSSL验签期间释放GIL）或 "process"。
+
+        margin_bits 为 split_payload 拆分大秘密时每个域元素保留的余量位数，见 for_payload；
+        payload_bits 为 split_payload 的默认载荷位宽，所有秘密都补零到同样数量的域元素。
+
+        random_source 为多项式系数的随机源："system"（默认，缓冲的 os.urandom）、"aes-ctr"
+        或 randomness.RandomSource 实例。"""
         self.t = threshold
         self.n = num_parties
-        self.modulus = modulus or self._generate_large_prime()
-        self.private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
-        self.public_key = self.private_key.public_key()
+        if generate_prime:
+            self.modulus = self._generate_large_prime(prime_bits or 2048)
+        elif isinstance(modulus, str):
+            self.modulus = get_standard_prime(modulus)
+        elif modulus:
+            self.modulus = modulus
+        else:
+            self.modulus = get_standard_prime(prime_bits or DEFAULT_PRIME)
+        if self.n >= self.modulus:
+            raise ValueError(f"参与方数量必须小于模数 {self.modulus}")
+        self.element_size = (self.modulus.bit_length() + 7) // 8
+        # 模数小于 2^31 或为 2^61-1 时，批量分割/重构走 NumPy uint64 快速路径
+        self.small_field = small_field.supports(self.modulus)
+        if margin_bits < 0:
+            raise ValueError("余量位数不能为负数")
+        self.margin_bits = margin_bits
+        self.payload_bits = payload_bits
+        self.random_source = create_random_source(random_source)
+        self.mask_pool = None
+        self._small_inverses = None
+        self._powers = None
+        self._interpolation_matrices = OrderedDict()
+        if auth_mode not in ("signature", "merkle", "mac"):
+            raise ValueError(f"未知的认证模式: {auth_mode}")
+        if mac_algorithm not in MAC_ALGORITHMS:
+            raise ValueError(f"未知的MAC算法: {mac_algorithm}")
+        if auth_mode == "mac" and mac_algorithm == "sha256":
+            raise ValueError("auth_mode='mac' 需要带密钥的MAC算法（hmac-sha256 或 blake2b）")
+        self.auth_mode = auth_mode
+        self.mac_algorithm = mac_algorithm
+        self.mac_key = mac_key if mac_key is not None or mac_algorithm == "sha256" else os.urandom(32)
+        self._party_mac_keys = {}
+        self._audit_executor = None
+        self.last_audit = None
+        if verify_executor not in ("thread", "process"):
+            raise ValueError(f"未知的验签执行器: {verify_executor}")
+        self.verify_workers = verify_workers
+        self.verify_executor = verify_executor
+        self._verify_pool = None
+        self._verified_roots = set()
+        self.signer = create_signer(signature_backend)
+        if private_key is not None:
+            self.load_private_key(private_key)
+        if public_key is not None:
+            self.load_public_key(public_key)
+
+    @property
+    def signature_backend(self) -> str:
+        return self.signer.name
+
+    @property
+    def private_key(self):
+        """签名私钥，首次访问时才生成"""
+        return self.signer.private_key
+
+    @private_key.setter
+    def private_key(self, key):
+        self.signer = signer_for_private_key(key)
+
+    @property
+    def public_key(self):
+        return self.signer.public_key
+
+    @public_key.setter
+    def public_key(self, key):
+        self.signer = signer_for_public_key(key)
+
+    def load_private_key(self, key, password: bytes = None):
+        """注入私钥（密钥对象或 PEM/DER 字节），签名后端随密钥类型切换"""
+        self.signer = signer_for_private_key(key, password=password)
+
+    def load_public_key(self, key):
+        """注入验签公钥（密钥对象或 PEM/DER 字节），之后该实例只能验签"""
+        self.signer = signer_for_public_key(key)
+
+    def export_private_key(self, encoding: str = "PEM", password: bytes = None) -> bytes:
+        return self.signer.export_private_key(encoding, password)
+
+    def export_public_key(self, encoding: str = "PEM") -> bytes:
+        return self.signer.export_public_key(encoding)
+
+    def save_profile(self, path: str, include_private_key: bool = False, password: bytes = None,
+                     include_mac_key: bool = False):
+        """保存方案配置（门限、模数、公钥，可选私钥与MAC主密钥），供聚合方/工作进程直接加载"""
+        profile = {
+            "threshold": self.t,
+            "num_parties": self.n,
+            "modulus": format(self.modulus, "x"),
+            "auth_mode": self.auth_mode,
+            "signature_backend": self.signature_backend,
+            "mac_algorithm": self.mac_algorithm,
+            "margin_bits": self.margin_bits,
+            "payload_bits": self.payload_bits,
+            "public_key": self.export_public_key().decode(),
+        }
+        if include_private_key:
+            profile["private_key"] = self.export_private_key(password=password).decode()
+        if include_mac_key and self.mac_key is not None:
+            profile["mac_key"] = self.mac_key.hex()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+
+    @classmethod
+    def load_profile(cls, path: str, password: bytes = None) -> "ShamirSecretSharing":
+        """从方案配置文件恢复实例，不生成任何新密钥或素数"""
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+        shamir = cls(profile["threshold"], profile["num_parties"], modulus=int(profile["modulus"], 16),
+                     auth_mode=profile.get("auth_mode", "signature"),
+                     signature_backend=profile.get("signature_backend", "rsa"),
+                     mac_algorithm=profile.get("mac_algorithm", "sha256"),
+                     margin_bits=profile.get("margin_bits", DEFAULT_MARGIN_BITS),
+                     payload_bits=profile.get("payload_bits"),
+                     mac_key=bytes.fromhex(profile["mac_key"]) if "mac_key" in profile else None)
+        if "private_key" in profile:
+            shamir.load_private_key(profile["private_key"], password=password)
+        else:
+            shamir.load_public_key(profile["public_key"])
+        return shamir
+
+    @classmethod
+    def for_payload(cls, threshold: int, num_parties: int, payload_bits: int,
+                    margin_bits: int = DEFAULT_MARGIN_BITS, **kwargs) -> "ShamirSecretSharing":
+        """按载荷位数选取能容纳 载荷 + 余量 的最小预置素数域（32位权重用 mersenne89，短文本用 p256 等），
+        小秘密的运算与份额随之变小；载荷超过所有预置域时使用最大的域，由 split_payload 拆成多个域元素"""
+        name = select_standard_prime(payload_bits, margin_bits, min_value=num_parties)
+        if name is None:
+            name = max(STANDARD_PRIMES, key=STANDARD_PRIMES.get)
+        return cls(threshold, num_parties, modulus=name, margin_bits=margin_bits, payload_bits=payload_bits,
+                   **kwargs)
+
+    @property
+    def payload_chunk_bits(self) -> int:
+        """split_payload 中每个域元素承载的载荷位数"""
+        return self.modulus.bit_length() - 1 - self.margin_bits
+
+    def split_payload(self, secret: int, epsilon: float = None, sensitivity: float = 1.0,
+                      payload_bits: int = None) -> list:
+        """分割不超过 payload_bits 位的非负整数秘密：按 payload_chunk_bits 从低位起拆成固定个数的域元素
+        （高位补零）后批量分割，份额向量长度只取决于 payload_bits，不泄露秘密的实际大小。
+        payload_bits 默认取构造参数（for_payload 会设置）"""
+        secret = operator.index(secret)
+        if secret < 0:
+            raise ValueError("秘密值不能为负数")
+        payload_bits = self.payload_bits if payload_bits is None else payload_bits
+        if payload_bits is None or payload_bits < 1:
+            raise ValueError("需要指定正的载荷位数 payload_bits")
+        if secret.bit_length() > payload_bits:
+            raise ValueError(f"秘密超过了 {payload_bits} 位的载荷宽度")
+        width = self.payload_chunk_bits
+        if width < 1:
+            raise ValueError(f"余量 {self.margin_bits} 位超过了模数位长，无法承载载荷")
+        mask = (1 << width) - 1
+        chunks = [(secret >> shift) & mask for shift in range(0, payload_bits, width)]
+        return self.split_secrets(chunks, epsilon, sensitivity)
+
+    def reconstruct_payload(self, share_vectors: list, audit: bool = False) -> int:
+        """split_payload 的逆过程；各元素的余量位吸收了份额求和产生的进位，拼接时按位移相加"""
+        chunks = self.reconstruct_secrets(share_vectors, audit)
+        width = self.payload_chunk_bits
+        return sum(int(chunk) << (i * width) for i, chunk in enumerate(chunks))
 
     def _generate_large_prime(self, bit_length: int = 2048) -> int:
-        """生成安全素数"""
-        while True:
-            p = secrets.randbits(bit_length)
-            p |= (1 << bit_length - 1) | 1
-            if self._is_probable_prime(p, k=40):
-                return p
+        """生成大素数（筛法预过滤 + Miller-Rabin，见 primes.generate_prime）"""
+        return generate_prime(bit_length)
 
     def _is_probable_prime(self, n: int, k: int = 40) -> bool:
         """Miller-Rabin素性测试"""
-        if n <= 1:
-            return False
-        if n <= 3:
-            return True
-        if n % 2 == 0:
-            return False
-        r, d = 0, n - 1
-        while d % 2 == 0:
-            r += 1
-            d //= 2
-        for _ in range(k):
-            a = random.randint(2, n - 2)
-            x = pow(a, d, n)
-            if x == 1 or x == n - 1:
-                continue
-            for _ in range(r - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
-                return False
-        return True
-
-    def _create_polynomial(self, secret: int, degree: int) -> callable:
-        """生成t-1次多项式"""
-        coefficients = [random.randrange(0, self.modulus) for _ in range(degree)]
-        return lambda x: (secret + sum(
-            c * pow(x, i + 1, self.modulus) for i, c in enumerate(coefficients))) % self.modulus
+        return is_probable_prime(n, k)
 
     def _add_laplace_noise(self, secret: int, epsilon: float, sensitivity: float) -> int:
         """添加差分隐私拉普拉斯噪声"""
@@ -66,8 +281,14 @@ class ShamirSecretSharing:
         noise = int(-scale * math.copysign(1, u) * math.log(1 - 2 * abs(u)))
         return (secret + noise) % self.modulus
 
-    def split_secret(self, secret: int, epsilon: float = None, sensitivity: float = 1.0) -> list:
-        """将秘密分割为n个份额，可选添加差分隐私"""
+    def split_secret(self, secret: int, epsilon: float = None, sensitivity: float = 1.0,
+                     strategy: str = None) -> list:
+        """将秘密分割为n个份额，可选添加差分隐私
+
+        strategy 选择求值方式："matrix" 使用缓存幂矩阵，"difference" 使用前向差分；
+        默认在参与方数量达到 DIFFERENCE_MIN_PARTIES 时自动切换到前向差分。
+        启用掩码池（enable_mask_pool）且未指定 strategy 时，直接把秘密加到预计算的掩码份额上。
+        """
         if secret >= self.modulus:
             raise ValueError(f"秘密值必须小于模数 {self.modulus}")
 
@@ -75,71 +296,753 @@ class ShamirSecretSharing:
         if epsilon is not None and epsilon > 0:
             secret = self._add_laplace_noise(secret, epsilon, sensitivity)
 
-        poly = self._create_polynomial(secret, self.t - 1)
-        shares = []
-        for i in range(1, self.n + 1):
-            x = i
-            y = poly(x)
-            signature = self.private_key.sign(
-                str(y).encode(),
-                padding=rsa_padding.PSS(
-                    mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()),
-                    salt_length=rsa_padding.PSS.MAX_LENGTH
-                ),
-                algorithm=hashes.SHA256()
-            )
-            mac = hashes.Hash(hashes.SHA256(), backend=default_backend())
-            mac.update(str(y).encode())
-            shares.append((x, y, signature, mac.finalize()))
-        return shares
+        if strategy is None:
+            if self.mask_pool is not None:
+                strategy = "mask"
+            else:
+                strategy = "difference" if self.n >= self.DIFFERENCE_MIN_PARTIES else "matrix"
+        if strategy == "mask":
+            if self.mask_pool is None:
+                raise ValueError("未启用掩码池")
+            ys = [(secret + m) % self.modulus for m in self.mask_pool.take()]
+        elif strategy in ("difference", "matrix"):
+            coefficients = self.random_source.field_elements(self.modulus, self.t - 1)
+            if strategy == "difference":
+                ys = self._evaluate_by_differences(secret, coefficients)
+            else:
+                ys = [(secret + sum(c * power for c, power in zip(coefficients, row))) % self.modulus
+                      for row in self._power_matrix()]
+        else:
+            raise ValueError(f"未知的求值策略: {strategy}")
+
+        messages = [self._scalar_message(y) for y in ys]
+        signatures = self._authenticate(messages)
+        return [(x, y, sig, self._mac(x, message))
+                for x, (y, message, sig) in enumerate(zip(ys, messages, signatures), start=1)]
+
+    def enable_mask_pool(self, capacity: int = 1024, low_watermark: int = None, batch_size: int = 256,
+                         background: bool = True) -> MaskPool:
+        """启用离线预计算的掩码池；background=False 时同步填满且不启动补充线程"""
+        self.disable_mask_pool()
+        self.mask_pool = MaskPool(self, capacity, low_watermark, batch_size, background)
+        if not background:
+            self.mask_pool.fill()
+        return self.mask_pool
+
+    def disable_mask_pool(self):
+        if self.mask_pool is not None:
+            self.mask_pool.stop()
+            self.mask_pool = None
+
+    def split_secrets(self, secrets_vector, epsilon: float = None, sensitivity: float = 1.0) -> list:
+        """批量分割秘密向量，返回n个份额向量 (x, [y...], signature, mac)，每方只签名一次。
+        secrets_vector 为 FieldVector 时份额向量也以 FieldVector 返回"""
+        if isinstance(secrets_vector, FieldVector):
+            return self._split_field_vector(secrets_vector, epsilon, sensitivity)
+        if self.small_field:
+            return self._split_small_field(secrets_vector, epsilon, sensitivity)
+        values = [operator.index(s) for s in secrets_vector]
+        for s in values:
+            if not 0 <= s < self.modulus:
+                raise ValueError(f"秘密值必须小于模数 {self.modulus}")
+
+        if epsilon is not None and epsilon > 0:
+            values = [self._add_laplace_noise(s, epsilon, sensitivity) for s in values]
+
+        # 系数矩阵：第j行是所有秘密的第j+1次项系数
+        flat = self.random_source.field_elements(self.modulus, (self.t - 1) * len(values))
+        coefficients = [flat[j * len(values):(j + 1) * len(values)] for j in range(self.t - 1)]
+        share_vectors = self._evaluate_shares(values, coefficients)
+        messages = [self._vector_message(ys) for ys in share_vectors]
+        signatures = self._authenticate(messages)
+        return [(x, ys, sig, self._mac(x, message))
+                for x, (ys, message, sig) in enumerate(zip(share_vectors, messages, signatures), start=1)]
+
+    def _split_field_vector(self, secrets: FieldVector, epsilon: float = None, sensitivity: float = 1.0) -> list:
+        """FieldVector 版本：每方份额 Y_x = S + Σ x^j·C_j 作为一次车道打包的线性组合求出"""
+        if secrets.modulus != self.modulus:
+            raise ValueError("FieldVector 的模数与方案模数不同")
+        if not secrets.in_range():
+            raise ValueError(f"秘密值必须小于模数 {self.modulus}")
+        if epsilon is not None and epsilon > 0:
+            secrets = FieldVector.from_ints([self._add_laplace_noise(s, epsilon, sensitivity) for s in secrets],
+                                            self.modulus)
+        coefficients = [FieldVector(self.random_source.field_bytes(self.modulus, len(secrets)), self.modulus)
+                        for _ in range(self.t - 1)]
+        vectors = [secrets] + coefficients
+        share_vectors = FieldVector.linear_combinations(vectors, [[1] + row for row in self._power_matrix()])
+        messages = [ys.tobytes() for ys in share_vectors]
+        signatures = self._authenticate(messages)
+        return [(x, ys, sig, self._mac(x, message))
+                for x, (ys, message, sig) in enumerate(zip(share_vectors, messages, signatures), start=1)]
+
+    def _split_small_field(self, secrets_vector, epsilon: float = None, sensitivity: float = 1.0) -> list:
+        """小素数域版本：系数生成与求值都是 uint64 向量运算；输入为 ndarray 时份额向量也是 ndarray"""
+        as_array = isinstance(secrets_vector, np.ndarray)
+        values = self._normalize_vector(secrets_vector)
+        if values is None:
+            raise ValueError(f"秘密值必须小于模数 {self.modulus}")
+        if epsilon is not None and epsilon > 0:
+            values = np.array([self._add_laplace_noise(int(s), epsilon, sensitivity) for s in values],
+                              dtype=np.uint64)
+        coefficients = self.random_source.field_array(self.modulus, (self.t - 1, values.shape[0]))
+        share_matrix = small_field.evaluate(values, coefficients, range(1, self.n + 1), self.modulus)
+        messages = [small_field.to_bytes(ys, self.element_size) for ys in share_matrix]
+        signatures = self._authenticate(messages)
+        return [(x, ys if as_array else ys.tolist(), sig, self._mac(x, message))
+                for x, (ys, message, sig) in enumerate(zip(share_matrix, messages, signatures), start=1)]
+
+    def _power_matrix(self) -> list:
+        """缓存的 n×(t-1) 范德蒙德幂矩阵，第i行为 [x, x^2, ..., x^(t-1)]，x=i+1"""
+        if self._powers is None:
+            matrix = []
+            for x in range(1, self.n + 1):
+                row = []
+                power = 1
+                for _ in range(self.t - 1):
+                    power = power * x % self.modulus
+                    row.append(power)
+                matrix.append(row)
+            self._powers = matrix
+        return self._powers
+
+    def _evaluate_by_differences(self, secret: int, coefficients: list) -> list:
+        """前向差分求值：x=1..n 连续，先求前 t 个点，之后每个份额只需 t-1 次模加"""
+        modulus = self.modulus
+        degree = len(coefficients)
+        head = []
+        for x in range(1, min(degree + 1, self.n) + 1):
+            acc = 0
+            for c in reversed(coefficients):
+                acc = (acc + c) * x % modulus
+            head.append((acc + secret) % modulus)
+        if self.n <= degree + 1:
+            return head
+
+        # differences[k] = Δ^k f(1)，Δ^degree 为常数
+        differences = []
+        row = head
+        while row:
+            differences.append(row[0])
+            row = [(b - a) % modulus for a, b in zip(row, row[1:])]
+
+        ys = [differences[0]]
+        for _ in range(self.n - 1):
+            for k in range(degree):
+                v = differences[k] + differences[k + 1]
+                differences[k] = v - modulus if v >= modulus else v
+            ys.append(differences[0])
+        return ys
+
+    def _evaluate_shares(self, values: list, coefficients: list) -> list:
+        """矩阵乘法 Y = S + P·C 一次求出所有参与方的份额向量"""
+        result = []
+        for row in self._power_matrix():
+            acc = list(values)
+            for power, coefficient_row in zip(row, coefficients):
+                acc = [a + power * c for a, c in zip(acc, coefficient_row)]
+            result.append([a % self.modulus for a in acc])
+        return result
+
+    def encode_element(self, y: int) -> bytes:
+        """域元素的规范编码：定长（模数字节数）大端字节串"""
+        return y.to_bytes(self.element_size, "big")
+
+    def decode_element(self, data) -> int:
+        return int.from_bytes(data, "big")
+
+    def decode_vector(self, data) -> list:
+        """把定长编码拼接成的字节串（如份额文件的一段）解码为整数列表"""
+        view = memoryview(data).cast("B")
+        size = self.element_size
+        if len(view) % size:
+            raise ValueError("份额向量字节长度不是元素宽度的整数倍")
+        return [int.from_bytes(view[i:i + size], "big") for i in range(0, len(view), size)]
+
+    def encode_shares(self, shares: list) -> bytes:
+        """把份额（或份额向量）列表编码为一个二进制批量帧，见 share_codec"""
+        return encode_batch(shares, self.element_size)
+
+    def decode_shares(self, data) -> list:
+        """解码 encode_shares 的输出；签名与MAC是指向输入缓冲区的只读视图"""
+        return decode_batch(data)
+
+    def _scalar_message(self, y: int) -> bytes:
+        """标量份额的认证消息，即 encode_element 的规范编码"""
+        return self.encode_element(y)
+
+    def _vector_message(self, ys) -> bytes:
+        """份额向量的认证消息：各元素定长编码依次拼接"""
+        if isinstance(ys, FieldVector):
+            return ys.tobytes()
+        if isinstance(ys, np.ndarray):
+            return small_field.to_bytes(ys, self.element_size)
+        size = self.element_size
+        return b"".join([y.to_bytes(size, "big") for y in ys])
+
+    def _sign_message(self, message: bytes) -> bytes:
+        return self.signer.sign(message)
+
+    def _verify_message(self, signature: bytes, message: bytes) -> bool:
+        return self.signer.verify(signature, message)
+
+    @staticmethod
+    def _leaf_message(x: int, message: bytes) -> bytes:
+        """Merkle叶子同时绑定参与方编号（4字节大端）和份额内容"""
+        return x.to_bytes(4, "big") + message
+
+    def _authenticate(self, messages: list) -> list:
+        """为 x=1..n 的份额消息生成认证信息：逐份签名，或在Merkle模式下只签一次树根；
+        纯MAC模式下不签名"""
+        if self.auth_mode == "mac":
+            return [b""] * len(messages)
+        if self.auth_mode == "merkle":
+            tree = MerkleTree([self._leaf_message(x, m) for x, m in enumerate(messages, start=1)])
+            root_signature = self._sign_message(tree.root)
+            return [MerkleProof(tree.root, root_signature, i, tree.count, tree.path(i))
+                    for i in range(tree.count)]
+        return [self._sign_message(m) for m in messages]
+
+    def _verify_share(self, x: int, message: bytes, auth) -> bool:
+        """验证单个份额的签名或Merkle包含证明；已验证过的树根签名直接复用"""
+        if self.auth_mode == "mac":
+            return True  # 完整性已由带密钥MAC保证
+        if isinstance(auth, MerkleProof):
+            if not verify_path(self._leaf_message(x, message), auth.index, auth.count, auth.path, auth.root):
+                return False
+            key = (auth.root, auth.signature)
+            if key in self._verified_roots:
+                return True
+            if not self._verify_message(auth.signature, auth.root):
+                return False
+            if len(self._verified_roots) >= 1024:
+                self._verified_roots.clear()
+            self._verified_roots.add(key)
+            return True
+        return self._verify_message(auth, message)
+
+    @staticmethod
+    def _hash_message(message: bytes) -> bytes:
+        h = hashes.Hash(hashes.SHA256(), backend=default_backend())
+        h.update(message)
+        return h.finalize()
+
+    def _party_mac_key(self, x: int) -> bytes:
+        """由主密钥派生参与方 x 的MAC密钥；只缓存合法参与方 1..n 的密钥，
+        防止伪造份额携带任意 x 使缓存无限增长"""
+        key = self._party_mac_keys.get(x)
+        if key is None:
+            label = b"shamir-party-mac" + x.to_bytes(4, "big")
+            if self.mac_algorithm == "blake2b":
+                key = hashlib.blake2b(label, key=self.mac_key, digest_size=32).digest()
+            else:
+                key = hmac.new(self.mac_key, label, hashlib.sha256).digest()
+            if 1 <= x <= self.n:
+                self._party_mac_keys[x] = key
+        return key
+
+    def _mac(self, x: int, message: bytes) -> bytes:
+        """计算份额MAC：旧版为无密钥SHA-256，带密钥模式下使用参与方密钥"""
+        if self.mac_algorithm == "sha256":
+            return self._hash_message(message)
+        key = self._party_mac_key(x)
+        if self.mac_algorithm == "blake2b":
+            return hashlib.blake2b(message, key=key, digest_size=32).digest()
+        return hmac.new(key, message, hashlib.sha256).digest()
+
+    def _check_mac(self, x: int, message: bytes, mac) -> bool:
+        if not isinstance(mac, (bytes, bytearray, memoryview)) or not 0 < x < 1 << 32:
+            return False
+        return hmac.compare_digest(self._mac(x, message), mac)
 
     @staticmethod
     def _lagrange_interpolate(x: int, points: list, modulus: int) -> int:
-        """拉格朗日插值"""
-        result = 0
-        for i in range(len(points)):
-            xi, yi = points[i]
-            li = 1
-            for j in range(len(points)):
+        """拉格朗日插值（先累乘分子分母，再批量求逆，仅一次模幂）"""
+        numerators = []
+        denominators = []
+        for i, (xi, _) in enumerate(points):
+            numerator = 1
+            denominator = 1
+            for j, (xj, _) in enumerate(points):
                 if i == j:
                     continue
-                xj = points[j][0]
-                numerator = (x - xj) % modulus
-                denominator = (xi - xj) % modulus
-                inv_denominator = pow(denominator, modulus - 2, modulus)
-                li = (li * numerator * inv_denominator) % modulus
-            result = (result + yi * li) % modulus
+                numerator = numerator * (x - xj) % modulus
+                denominator = denominator * (xi - xj) % modulus
+            numerators.append(numerator)
+            denominators.append(denominator)
+        inv_denominators = ShamirSecretSharing._batch_inverse(denominators, modulus)
+        result = 0
+        for (_, yi), numerator, inv_denominator in zip(points, numerators, inv_denominators):
+            result += yi * numerator * inv_denominator
+        return result % modulus
+
+    @staticmethod
+    def _batch_inverse(values: list, modulus: int) -> list:
+        """Montgomery批量求逆：3(k-1)次乘法 + 1次模幂得到k个逆元"""
+        if not values:
+            return []
+        prefix = []
+        acc = 1
+        for v in values:
+            acc = acc * v % modulus
+            prefix.append(acc)
+        inv = pow(acc, modulus - 2, modulus)
+        result = [0] * len(values)
+        for i in range(len(values) - 1, 0, -1):
+            result[i] = inv * prefix[i - 1] % modulus
+            inv = inv * values[i] % modulus
+        result[0] = inv
         return result
 
-    def reconstruct_secret(self, shares: list) -> int:
-        """从份额中恢复秘密"""
+    def _inverse_table(self) -> list:
+        """1..n 的模逆表（下标即数值），首次使用时批量构建"""
+        if self._small_inverses is None:
+            self._small_inverses = [0] + self._batch_inverse(list(range(1, self.n + 1)), self.modulus)
+        return self._small_inverses
+
+    def reconstruct_secret(self, shares: list, audit: bool = False) -> int:
+        """从份额中恢复秘密；凑够t个有效份额即停止校验，audit=True 时在后台审计其余份额"""
+        valid_shares = self._select_valid_shares(shares, self._normalize_scalar, self._scalar_message, audit)
+        weights = self._cached_lagrange_weights([x for x, _ in valid_shares])
+        return sum(weights[x] * y for x, y in valid_shares) % self.modulus
+
+    def _cached_lagrange_weights(self, xs: list) -> dict:
+        """从LRU缓存获取 {x: λ_x(0)}"""
+        return self.lagrange_cache.get(self.modulus, xs,
+                                       lambda ordered: self._lagrange_weights(ordered, self.modulus,
+                                                                              self._inverse_table()))
+
+    def reconstruct_secrets(self, share_vectors: list, audit: bool = False) -> list:
+        """从份额向量中批量恢复秘密向量，拉格朗日系数只计算一次。
+        份额向量的 ys 也可以是定长编码的字节串（例如份额存储中内存映射的一段）；
+        ys 都是 FieldVector 时结果也是 FieldVector"""
+        valid_shares = self._select_valid_shares(share_vectors, self._normalize_vector, self._vector_message,
+                                                 audit)
+        length = len(valid_shares[0][1])
+        if any(len(ys) != length for _, ys in valid_shares):
+            raise ValueError("份额向量长度不一致")
+        weights = self._cached_lagrange_weights([x for x, _ in valid_shares])
+        if all(isinstance(ys, FieldVector) for _, ys in valid_shares):
+            return FieldVector.linear_combination([ys for _, ys in valid_shares],
+                                                  [weights[x] for x, _ in valid_shares])
+        if self.small_field:
+            result = small_field.combine([ys for _, ys in valid_shares], [weights[x] for x, _ in valid_shares],
+                                         self.modulus)
+            # 只看结构完整的输入；畸形条目已被 _select_valid_shares 跳过，这里也不能因它们抛异常
+            as_array = all(isinstance(share[1], np.ndarray) for share in share_vectors
+                           if isinstance(share, (tuple, list)) and len(share) == 4)
+            return result if as_array else result.tolist()
+        result = [0] * length
+        for x, ys in valid_shares:
+            w = weights[x]
+            result = [r + w * y for r, y in zip(result, ys)]
+        return [r % self.modulus for r in result]
+
+    # ------------------------------------------------------------------
+    # 打包秘密共享（Franklin–Yung）
+    #
+    # 每k个秘密放在同一个多项式的 0, -1, ..., -(k-1) 处：f = g + Z·h，g 为过k个秘密点的 k-1 次插值多项式，
+    # Z(X) = X(X+1)...(X+k-1) 在秘密点处为0，h 为 t-2 次随机多项式，f 的次数为 t+k-2。
+    # 份额数量和求值工作量约降为逐个分割的 1/k，代价是：
+    #   - 重构需要 t+k-1 个份额（而不是t个），因此要求 n >= t+k-1；
+    #   - 任意 t-1 个份额不泄露任何信息，但 t 到 t+k-2 个份额会泄露秘密之间的部分线性关系。
+    # 即在参与方总数n固定时，隐私门限 t-1 与打包因子k此消彼长：t + k - 1 <= n。
+    # ------------------------------------------------------------------
+
+    def _packed_points(self, k: int) -> list:
+        """秘密所在点 0, -1, ..., -(k-1) (mod p)，与参与方编号 1..n 不相交"""
+        if k < 1:
+            raise ValueError("打包因子k必须为正整数")
+        if self.t + k - 1 > self.n:
+            raise ValueError(f"打包因子过大：需要 t+k-1 <= n（t={self.t}, k={k}, n={self.n}）")
+        if self.n + k >= self.modulus:
+            raise ValueError("模数太小，无法容纳打包秘密所需的求值点")
+        return [(-j) % self.modulus for j in range(k)]
+
+    def _packed_split_matrix(self, k: int) -> tuple:
+        """分割矩阵：第x行为 [N_0(x), ..., N_{k-1}(x), Z(x), Z(x)·x, ..., Z(x)·x^(t-2)]，
+        N_j(x) = Π_{i≠j}(x+i) 与 Z(x) 都是小整数；另返回 g 的分母逆元 1/Π_{i≠j}(i-j)，
+        这样每个秘密只需一次大数乘法，其余都是小整数乘大数"""
+        denominators = [math.prod(i - j for i in range(k) if i != j) % self.modulus for j in range(k)]
+        matrix = []
+        for x in range(1, self.n + 1):
+            row = [math.prod(x + i for i in range(k) if i != j) for j in range(k)]
+            z = math.prod(x + i for i in range(k))
+            row += [z * x ** i for i in range(self.t - 1)]
+            matrix.append(row)
+        return matrix, self._batch_inverse(denominators, self.modulus)
+
+    def _interpolation_matrix(self, key: tuple, compute: callable) -> list:
+        """缓存打包分割/重构、种子分割用的插值矩阵（LRU，最多 LagrangeCache 默认容量个）"""
+        matrix = self._interpolation_matrices.get(key)
+        if matrix is None:
+            matrix = self._interpolation_matrices[key] = compute()
+            while len(self._interpolation_matrices) > self.lagrange_cache.maxsize:
+                self._interpolation_matrices.popitem(last=False)
+        else:
+            self._interpolation_matrices.move_to_end(key)
+        return matrix
+
+    def split_packed(self, secrets_vector, k: int, epsilon: float = None, sensitivity: float = 1.0) -> list:
+        """打包分割：每个多项式携带k个秘密，返回n个份额向量 (x, [y...], signature, mac)，
+        向量长度为 ceil(秘密个数/k)；不足k个的末块补0。用 reconstruct_packed 恢复"""
+        values = [operator.index(s) for s in secrets_vector]
+        for s in values:
+            if not 0 <= s < self.modulus:
+                raise ValueError(f"秘密值必须小于模数 {self.modulus}")
+        if epsilon is not None and epsilon > 0:
+            values = [self._add_laplace_noise(s, epsilon, sensitivity) for s in values]
+
+        self._packed_points(k)
+        blocks = -(-len(values) // k)
+        values += [0] * (blocks * k - len(values))
+        matrix, inverses = self._interpolation_matrix(("split", k), lambda: self._packed_split_matrix(k))
+        # 行 j (< k) 为各块第j个秘密除以 g 的分母，其余 t-1 行为 h 的随机系数
+        rows = [[v * inverses[j] % self.modulus for v in values[j::k]] for j in range(k)]
+        flat = self.random_source.field_elements(self.modulus, (self.t - 1) * blocks)
+        rows += [flat[i * blocks:(i + 1) * blocks] for i in range(self.t - 1)]
+
+        share_vectors = []
+        for coefficients in matrix:
+            acc = [0] * blocks
+            for c, row in zip(coefficients, rows):
+                acc = [a + c * v for a, v in zip(acc, row)]
+            share_vectors.append([a % self.modulus for a in acc])
+        messages = [self._vector_message(ys) for ys in share_vectors]
+        signatures = self._authenticate(messages)
+        return [(x, ys, sig, self._mac(x, message))
+                for x, (ys, message, sig) in enumerate(zip(share_vectors, messages, signatures), start=1)]
+
+    def reconstruct_packed(self, share_vectors: list, k: int, count: int = None, audit: bool = False) -> list:
+        """从至少 t+k-1 个有效份额向量恢复打包的秘密；count 为原始秘密个数（去掉末块补的0）"""
+        secret_points = self._packed_points(k)
+        valid_shares = self._select_valid_shares(share_vectors, self._normalize_vector, self._vector_message,
+                                                 audit, quorum=self.t + k - 1)
+        blocks = len(valid_shares[0][1])
+        if any(len(ys) != blocks for _, ys in valid_shares):
+            raise ValueError("份额向量长度不一致")
+        xs = sorted(x for x, _ in valid_shares)
+        by_x = dict(valid_shares)
+        matrix = self._interpolation_matrix(("reconstruct", k, tuple(xs)), lambda: self._lagrange_matrix(
+            xs, secret_points, self.modulus))
+
+        columns = []
+        for weights in matrix:
+            acc = [0] * blocks
+            for w, x in zip(weights, xs):
+                acc = [a + w * int(y) for a, y in zip(acc, by_x[x])]
+            columns.append([a % self.modulus for a in acc])
+        secrets = [columns[j][b] for b in range(blocks) for j in range(k)]
+        return secrets if count is None else secrets[:count]
+
+    # ------------------------------------------------------------------
+    # 种子压缩分割：参与方 1..t-1 的份额向量由32字节种子经 AES-CTR 展开，
+    # 其余参与方的份额由 (0, 秘密) 与这 t-1 个点插值求出，分发方上传量约减少 (t-1)/n
+    # ------------------------------------------------------------------
+
+    def _seeded_split_matrix(self) -> tuple:
+        """第 x (= t..n) 行为 N_i(x) = Π_{j≠i}(x-j)（i, j = 0..t-1，小整数），
+        另返回分母 Π_{j≠i}(i-j) 的逆元，先把输入向量除以分母，之后只有小整数乘大数"""
+        points = range(self.t)
+        denominators = [math.prod(i - j for j in points if j != i) % self.modulus for i in points]
+        matrix = [[math.prod(x - j for j in points if j != i) for i in points] for x in range(self.t, self.n + 1)]
+        return matrix, self._batch_inverse(denominators, self.modulus)
+
+    def split_seeded(self, secrets_vector, epsilon: float = None, sensitivity: float = 1.0) -> list:
+        """与 split_secrets 相同的份额向量，但参与方 1..t-1 的 ys 为 SeededVector(种子, 长度)；
+        签名/MAC 针对展开后的向量，reconstruct_secrets 和 verify_shares 可直接处理种子份额"""
+        values = [operator.index(s) for s in secrets_vector]
+        for s in values:
+            if not 0 <= s < self.modulus:
+                raise ValueError(f"秘密值必须小于模数 {self.modulus}")
+        if epsilon is not None and epsilon > 0:
+            values = [self._add_laplace_noise(s, epsilon, sensitivity) for s in values]
+
+        length = len(values)
+        seeds = [self.random_source.read(SEED_SIZE) for _ in range(self.t - 1)]
+        seeded = [expand_seed(seed, self.modulus, length) for seed in seeds]
+        matrix, inverses = self._interpolation_matrix(("seeded",), self._seeded_split_matrix)
+        rows = [[v * inv % self.modulus for v in vector] for vector, inv in zip([values] + seeded, inverses)]
+        solved = []
+        for coefficients in matrix:
+            acc = [0] * length
+            for c, row in zip(coefficients, rows):
+                acc = [a + c * v for a, v in zip(acc, row)]
+            solved.append([a % self.modulus for a in acc])
+
+        share_vectors = seeded + solved
+        messages = [self._vector_message(ys) for ys in share_vectors]
+        signatures = self._authenticate(messages)
+        payloads = [SeededVector(seed, length) for seed in seeds] + solved
+        return [(x, ys, sig, self._mac(x, message))
+                for x, (ys, message, sig) in enumerate(zip(payloads, messages, signatures), start=1)]
+
+    def expand_share(self, share: tuple) -> tuple:
+        """把种子份额展开为完整的份额向量（参与方收到种子后本地调用）"""
+        x, ys, sig, mac = share
+        if isinstance(ys, SeededVector):
+            ys = self._expand_seeded(ys)
+            ys = ys.tolist() if isinstance(ys, np.ndarray) else ys
+        return x, ys, sig, mac
+
+    def _expand_seeded(self, ys: SeededVector):
+        if len(ys.seed) != SEED_SIZE or ys.length < 0:
+            raise ValueError("种子份额格式错误")
+        return expand_seed(ys.seed, self.modulus, ys.length, as_array=self.small_field)
+
+    def _normalize_scalar(self, y):
+        """结构与范围检查：返回规范化的y，不合法时返回 None"""
+        y = operator.index(y)
+        return y if 0 <= y < self.modulus else None
+
+    def _normalize_vector(self, ys):
+        if isinstance(ys, SeededVector):
+            ys = self._expand_seeded(ys)
+        if isinstance(ys, FieldVector):
+            return ys if ys.modulus == self.modulus and ys.in_range() else None
+        if self.small_field:
+            return self._normalize_small_vector(ys)
+        if isinstance(ys, (bytes, bytearray, memoryview)):
+            ys = self.decode_vector(ys)
+        else:
+            ys = [operator.index(y) for y in ys]
+        return ys if all(0 <= y < self.modulus for y in ys) else None
+
+    def _normalize_small_vector(self, ys):
+        """小素数域：统一转换为一维 uint64 数组并做范围检查"""
+        if isinstance(ys, (bytes, bytearray, memoryview)):
+            ys = small_field.from_bytes(ys, self.element_size)
+        elif isinstance(ys, np.ndarray):
+            if ys.ndim != 1 or ys.dtype.kind not in "iu" or (ys.dtype.kind == "i" and ys.size and ys.min() < 0):
+                return None
+            ys = ys.astype(np.uint64, copy=False)
+        else:
+            ys = [operator.index(y) for y in ys]
+            if not all(0 <= y < self.modulus for y in ys):
+                return None
+            ys = np.array(ys, dtype=np.uint64)
+        return ys if not ys.size or int(ys.max()) < self.modulus else None
+
+    def _check_share(self, share, normalize: callable, to_message: callable, accepted_xs: set):
+        """按代价从低到高校验单个份额：结构/范围 -> 重复x -> MAC -> 签名。
+        通过时返回 (x, y)，否则返回 None"""
+        candidate = self._precheck_share(share, normalize, to_message, accepted_xs)
+        if candidate is None:
+            return None
+        x, y, message, sig = candidate
+        if not self._verify_share(x, message, sig):
+            return None
+        return x, y
+
+    def _select_valid_shares(self, shares: list, normalize: callable, to_message: callable,
+                             audit: bool = False, quorum: int = None) -> list:
+        """依次校验份额直到得到 quorum（默认t）个有效份额，剩余份额不再做公钥验签"""
+        quorum = quorum or self.t
+        if self.verify_workers and self.verify_workers > 1:
+            return self._select_valid_shares_parallel(shares, normalize, to_message, audit, quorum)
         valid_shares = []
-        seen_xs = set()
-        for x, y, sig, mac in shares:
+        accepted_xs = set()
+        shares = list(shares)
+        for index, share in enumerate(shares):
+            checked = self._check_share(share, normalize, to_message, accepted_xs)
+            if checked is None:
+                continue
+            accepted_xs.add(checked[0])
+            valid_shares.append(checked)
+            if len(valid_shares) == quorum:
+                if audit:
+                    self._start_audit(shares[index + 1:], normalize, to_message)
+                break
+
+        if len(valid_shares) < quorum:
+            raise ValueError(f"有效份额不足（需要至少 {quorum} 个，有 {len(valid_shares)} 个）")
+        return valid_shares
+
+    def _select_valid_shares_parallel(self, shares: list, normalize: callable, to_message: callable,
+                                      audit: bool = False, quorum: int = None) -> list:
+        """并行版本：每轮取出还差的份额数（至少 verify_workers 个）并行验签，凑够 quorum 个即停止"""
+        quorum = quorum or self.t
+        valid_shares = []
+        accepted_xs = set()
+        shares = list(shares)
+        position = 0
+        while len(valid_shares) < quorum and position < len(shares):
+            wave = []
+            wave_size = max(quorum - len(valid_shares), self.verify_workers)
+            while position < len(shares) and len(wave) < wave_size:
+                candidate = self._precheck_share(shares[position], normalize, to_message, accepted_xs)
+                if candidate is not None:
+                    wave.append(candidate)
+                position += 1
+            mask = self._verify_signatures([(x, message, sig) for x, _, message, sig in wave])
+            for (x, y, _, _), ok in zip(wave, mask):
+                if ok and x not in accepted_xs and len(valid_shares) < quorum:
+                    accepted_xs.add(x)
+                    valid_shares.append((x, y))
+
+        if len(valid_shares) < quorum:
+            raise ValueError(f"有效份额不足（需要至少 {quorum} 个，有 {len(valid_shares)} 个）")
+        if audit and position < len(shares):
+            self._start_audit(shares[position:], normalize, to_message)
+        return valid_shares
+
+    def _precheck_share(self, share, normalize: callable, to_message: callable, accepted_xs: set):
+        """验签之前的廉价检查（结构/范围、重复x、MAC），通过时返回 (x, y, message, sig)"""
+        try:
+            x, y, sig, mac = share
+            x = operator.index(x)
+            if not 0 < x < self.modulus:
+                return None
+            y = normalize(y)
+        except (TypeError, ValueError):
+            return None
+        if y is None or x in accepted_xs:
+            return None
+        message = to_message(y)
+        if not self._check_mac(x, message, mac):
+            return None
+        return x, y, message, sig
+
+    def verify_shares(self, shares: list) -> list:
+        """批量校验份额（标量份额或份额向量均可），返回与输入一一对应的布尔掩码"""
+        candidates = []
+        for index, share in enumerate(shares):
             try:
-                self.public_key.verify(
-                    sig,
-                    str(y).encode(),
-                    padding=rsa_padding.PSS(
-                        mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()),
-                        salt_length=rsa_padding.PSS.MAX_LENGTH
-                    ),
-                    algorithm=hashes.SHA256()
-                )
-                h = hashes.Hash(hashes.SHA256(), backend=default_backend())
-                h.update(str(y).encode())
-                if h.finalize() != mac or y < 0 or y >= self.modulus:
-                    continue
-                if x in seen_xs:
-                    continue  # 重复份额，不计入有效份额
-                seen_xs.add(x)
-                valid_shares.append((x, y))
-            except Exception:
+                vector = not isinstance(share[1], numbers.Integral)
+            except (TypeError, IndexError):
                 continue
+            if vector:
+                candidate = self._precheck_share(share, self._normalize_vector, self._vector_message, set())
+            else:
+                candidate = self._precheck_share(share, self._normalize_scalar, self._scalar_message, set())
+            if candidate is not None:
+                candidates.append((index, candidate))
+        mask = [False] * len(shares)
+        results = self._verify_signatures([(x, message, sig) for _, (x, _, message, sig) in candidates])
+        for (index, _), ok in zip(candidates, results):
+            mask[index] = ok
+        return mask
+
+    def _verify_signatures(self, items: list) -> list:
+        """对 [(x, message, auth), ...] 验签；配置了并行池时把普通签名分块分发到池中"""
+        if self.auth_mode == "mac" or not self.verify_workers or self.verify_workers <= 1 or len(items) <= 1:
+            return [self._verify_share(x, message, auth) for x, message, auth in items]
+
+        results = [None] * len(items)
+        plain = []
+        for index, (x, message, auth) in enumerate(items):
+            if isinstance(auth, MerkleProof):
+                results[index] = self._verify_share(x, message, auth)  # 只需哈希，根签名有缓存
+            else:
+                plain.append(index)
+        if not plain:
+            return results
+
+        pool = self._get_verify_pool()
+        chunk = max(1, -(-len(plain) // self.verify_workers))
+        chunks = [plain[i:i + chunk] for i in range(0, len(plain), chunk)]
+        if self.verify_executor == "process":
+            public_der = self.export_public_key(encoding="DER")
+            # 解码得到的签名是 memoryview，不能 pickle，发往子进程前复制为 bytes
+            futures = [pool.submit(verify_batch, public_der, [(bytes(items[i][2]), bytes(items[i][1])) for i in part])
+                       for part in chunks]
+        else:
+            futures = [pool.submit(lambda part: [self._verify_message(items[i][2], items[i][1]) for i in part],
+                                   part) for part in chunks]
+        for part, future in zip(chunks, futures):
+            for index, ok in zip(part, future.result()):
+                results[index] = ok
+        return results
 
-        if len(valid_shares) < self.t:
-            raise ValueError(f"有效份额不足（需要至少 {self.t} 个，有 {len(valid_shares)} 个）")
-        return self._lagrange_interpolate(0, valid_shares, self.modulus)
+    def _get_verify_pool(self):
+        if self._verify_pool is None:
+            if self.verify_executor == "process":
+                self._verify_pool = ProcessPoolExecutor(max_workers=self.verify_workers)
+            else:
+                self._verify_pool = ThreadPoolExecutor(max_workers=self.verify_workers,
+                                                       thread_name_prefix="share-verify")
+        return self._verify_pool
+
+    def close(self):
+        """关闭验签池、审计线程与掩码池补充线程"""
+        self.disable_mask_pool()
+        for pool in (self._verify_pool, self._audit_executor):
+            if pool is not None:
+                pool.shutdown(wait=True)
+        self._verify_pool = None
+        self._audit_executor = None
+
+    def _start_audit(self, shares: list, normalize: callable, to_message: callable):
+        """在后台线程中校验提前退出后未检查的份额，结果（无效份额列表）保存在 self.last_audit"""
+        if self._audit_executor is None:
+            self._audit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="share-audit")
+
+        def audit():
+            # 审计只判断份额本身是否可信，与已接受份额重复x不算无效
+            return [share for share in shares
+                    if self._check_share(share, normalize, to_message, set()) is None]
+
+        self.last_audit = self._audit_executor.submit(audit)
+
+    @staticmethod
+    def _lagrange_matrix(xs: list, targets, modulus: int) -> list:
+        """插值矩阵 M[r][i] = L_i(targets[r])：把 xs 处的取值线性映射为 targets 处的取值；
+        分母批量求逆一次，分子用前缀/后缀积逐目标点求出"""
+        xs = list(xs)
+        denominators = []
+        for i, xi in enumerate(xs):
+            denominator = 1
+            for j, xj in enumerate(xs):
+                if i != j:
+                    denominator = denominator * (xi - xj) % modulus
+            denominators.append(denominator)
+        inverses = ShamirSecretSharing._batch_inverse(denominators, modulus)
+        matrix = []
+        for target in targets:
+            differences = [(target - xj) % modulus for xj in xs]
+            suffix = [1] * (len(xs) + 1)
+            for i in range(len(xs) - 1, -1, -1):
+                suffix[i] = suffix[i + 1] * differences[i] % modulus
+            row = []
+            prefix = 1
+            for i in range(len(xs)):
+                row.append(prefix * suffix[i + 1] % modulus * inverses[i] % modulus)
+                prefix = prefix * differences[i] % modulus
+            matrix.append(row)
+        return matrix
+
+    @staticmethod
+    def _lagrange_weights(xs: list, modulus: int, inverses: list = None) -> list:
+        """计算在0处的拉格朗日基系数 λ_i(0)
+
+        分母是参与方编号之差，落在逆元表范围内时直接查表相乘；
+        其余部分累乘后批量求逆，整体不超过一次模幂。
+        """
+        numerators = []
+        table_parts = []
+        residual_denominators = []
+        for i, xi in enumerate(xs):
+            numerator = 1
+            table_part = 1
+            residual = 1
+            for j, xj in enumerate(xs):
+                if i == j:
+                    continue
+                numerator = numerator * -xj % modulus
+                d = xi - xj
+                if inverses is not None and 0 < abs(d) < len(inverses):
+                    table_part = table_part * (inverses[d] if d > 0 else modulus - inverses[-d]) % modulus
+                else:
+                    residual = residual * d % modulus
+            numerators.append(numerator)
+            table_parts.append(table_part)
+            residual_denominators.append(residual)
+        if any(r != 1 for r in residual_denominators):
+            residual_inverses = ShamirSecretSharing._batch_inverse(residual_denominators, modulus)
+        else:
+            residual_inverses = residual_denominators
+        return [num * part * inv % modulus
+                for num, part, inv in zip(numerators, table_parts, residual_inverses)]
 
     @staticmethod
     def encode_text_secret(text: str) -> int:
@@ -147,11 +1050,10 @@ class ShamirSecretSharing:
         data_bytes = text.encode('utf-8')
         return int.from_bytes(data_bytes, byteorder='big')
 
-    @staticmethod
     def encode_image_secret(self, image_path: str, max_pixels: int = 10000, epsilon: float = None,
-                            sensitivity: float = 1.0) -> tuple:
+                            sensitivity: float = 1.0, pixel_bits: int = 8) -> tuple:
         """将图片编码为整数（含差分隐私支持），返回编码整数、盐值、图像尺寸"""
-        secret, salt, shape = self._raw_encode_image(image_path, max_pixels)
+        secret, salt, shape = self._raw_encode_image(image_path, max_pixels, pixel_bits)
 
         # 差分隐私处理
         if epsilon is not None and epsilon > 0:
@@ -159,8 +1061,9 @@ class ShamirSecretSharing:
 
         return secret, salt, shape
 
-    def _raw_encode_image(self, image_path: str, max_pixels: int) -> tuple:
-        """核心图片编码逻辑（不包含模数和隐私处理）"""
+    def _raw_encode_image(self, image_path: str, max_pixels: int, pixel_bits: int = 8) -> tuple:
+        """核心图片编码逻辑（不包含模数和隐私处理）；每个像素默认占8位（与旧版逐像素移位相同），
+        像素已压缩到 0-127，pixel_bits=7 可紧密拼接、节省 1/8 的位数"""
         try:
             img = Image.open(image_path).convert('L')
 
@@ -188,10 +1091,7 @@ class ShamirSecretSharing:
             pixels = (pixels + salt) % 128
             pixels = np.clip(pixels, 0, 127).astype(np.uint8)
 
-            secret = 0
-            for pixel in pixels:
-                secret = (secret << 8) | int(pixel)
-            secret = secret % self.modulus
+            secret = pixels_to_int(pixels, pixel_bits) % self.modulus
             secret = secret if secret != 0 else 1
 
             compressed_image_path = image_path.replace('.png', '_compressed.png') \
@@ -214,19 +1114,10 @@ class ShamirSecretSharing:
         noise = np.random.laplace(loc=0, scale=sensitivity / epsilon)
         return int(value + noise) % self.modulus
 
-    @staticmethod
-    def decode_compressed_image(self, secret_int: int, output_path: str = None, shape: tuple = (100, 100)) -> Image:
-        """将整数解码为压缩后的图像"""
-        pixels = []
-        temp = secret_int
-        while temp > 0 and len(pixels) < shape[0] * shape[1]:
-            pixels.append(temp & 0xFF)
-            temp = temp >> 8
-        pixels = pixels[::-1]
-
-        if len(pixels) < shape[0] * shape[1]:
-            pixels = [0] * (shape[0] * shape[1] - len(pixels)) + pixels
-
+    def decode_compressed_image(self, secret_int: int, output_path: str = None, shape: tuple = (100, 100),
+                                pixel_bits: int = 8) -> Image:
+        """将整数解码为压缩后的图像（pixel_bits 须与编码时一致）"""
+        pixels = int_to_pixels(secret_int, shape[0] * shape[1], pixel_bits)
         pixels = np.clip(pixels, 0, 127).astype(np.uint8)
         pixels = (pixels.astype(np.uint16) * 2).clip(0, 255).astype(np.uint8)
 
@@ -237,19 +1128,10 @@ class ShamirSecretSharing:
             img.save(output_path)
         return img
 
-    def sign_value(self, y: int):
-        """为给定的y值生成签名和MAC"""
-        signature = self.private_key.sign(
-            str(y).encode(),
-            padding=rsa_padding.PSS(
-                mgf=rsa_padding.MGF1(hashes.SHA256()),
-                salt_length=rsa_padding.PSS.MAX_LENGTH
-            ),
-            algorithm=hashes.SHA256()
-        )
-
-        h = hashes.Hash(hashes.SHA256(), backend=default_backend())
-        h.update(str(y).encode())
-        mac = h.finalize()
-
-        return signature, mac
\ No newline at end of file
+    def sign_value(self, y: int, x: int = None):
+        """为给定的y值生成签名和MAC（带密钥MAC模式需要提供参与方编号x）"""
+        if x is None and self.mac_algorithm != "sha256":
+            raise ValueError("带密钥MAC模式下需要提供参与方编号 x")
+        message = self._scalar_message(y)
+        signature = b"" if self.auth_mode == "mac" else self._sign_message(message)
+        return signature, self._mac(x, message)
@@ -0,0 +1,210 @@
+"""份额的版本化二进制线格式
+
+单个份额：
+    magic b"SH" | version u8 | flags u8 | element_size u16(大端)
+    x varint
+    y: 标量为 element_size 字节；向量为 varint 元素个数 + 个数 × element_size 字节；
+       种子份额（版本2）为 varint 元素个数 + 32字节种子
+    认证信息: 普通签名为 varint 长度 + 签名；
+              Merkle证明为 32字节树根 + varint 长度 + 根签名 + varint index + varint count
+              + varint 路径长度 + 路径长度 × 32字节
+    mac: varint 长度 + MAC
+
+批量帧：magic b"SB" | version u8 | flags u8 | element_size u16 | varint 份额个数
+        | 每个份额前加 varint 字节长度
+
+解码直接在 memoryview 上进行：标量 y 由 int.from_bytes 读取切片；份额向量、签名与MAC以只读
+memoryview 切片返回，不复制底层缓冲区（向量切片可直接交给 reconstruct_secrets 或 decode_vector）。
+"""
+import numbers
+import struct
+from merkle import MerkleProof
+from randomness import SEED_SIZE, SeededVector
+
+SHARE_MAGIC = b"SH"
+BATCH_MAGIC = b"SB"
+VERSION = 1
+SEED_VERSION = 2  # 含种子份额的单个份额使用版本2，旧解码器会按版本号拒绝
+
+FLAG_VECTOR = 0x01
+FLAG_MERKLE = 0x02
+FLAG_SEED = 0x04
+
+_KNOWN_FLAGS = {VERSION: FLAG_VECTOR | FLAG_MERKLE, SEED_VERSION: FLAG_VECTOR | FLAG_MERKLE | FLAG_SEED}
+
+_HEADER = struct.Struct(">2sBBH")
+_DIGEST_SIZE = 32
+
+
+def write_varint(out: bytearray, value: int):
+    """无符号 LEB128 编码"""
+    if value < 0:
+        raise ValueError("varint 不能为负数")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(view: memoryview, offset: int) -> tuple:
+    """读取 LEB128 整数，返回 (值, 新偏移)"""
+    result = 0
+    shift = 0
+    while True:
+        if offset >= len(view):
+            raise ValueError("份额数据被截断")
+        byte = view[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+def _write_bytes(out: bytearray, data):
+    write_varint(out, len(data))
+    out += data
+
+
+def _read_bytes(view: memoryview, offset: int) -> tuple:
+    length, offset = read_varint(view, offset)
+    end = offset + length
+    if end > len(view):
+        raise ValueError("份额数据被截断")
+    return view[offset:end], end
+
+
+def encode_share(share: tuple, element_size: int) -> bytes:
+    """把 (x, y 或 [y...], 认证信息, mac) 编码为字节串"""
+    out = bytearray()
+    encode_share_into(out, share, element_size)
+    return bytes(out)
+
+
+def encode_share_into(out: bytearray, share: tuple, element_size: int):
+    x, y, auth, mac = share
+    seeded = isinstance(y, SeededVector)
+    vector = not isinstance(y, numbers.Integral)
+    merkle = isinstance(auth, MerkleProof)
+    flags = (FLAG_VECTOR if vector else 0) | (FLAG_MERKLE if merkle else 0) | (FLAG_SEED if seeded else 0)
+    out += _HEADER.pack(SHARE_MAGIC, SEED_VERSION if seeded else VERSION, flags, element_size)
+    write_varint(out, x)
+    if seeded:
+        if len(y.seed) != SEED_SIZE:
+            raise ValueError("种子份额格式错误")
+        write_varint(out, y.length)
+        out += y.seed
+    elif isinstance(y, (bytes, bytearray, memoryview)):
+        # 解码得到的向量仍是定长编码的字节视图，原样写回
+        if len(y) % element_size:
+            raise ValueError("份额向量字节长度不是元素宽度的整数倍")
+        write_varint(out, len(y) // element_size)
+        out += y
+    elif vector:
+        ys = list(y)
+        write_varint(out, len(ys))
+        out += b"".join([int(v).to_bytes(element_size, "big") for v in ys])
+    else:
+        out += int(y).to_bytes(element_size, "big")
+    if merkle:
+        out += auth.root
+        _write_bytes(out, auth.signature)
+        write_varint(out, auth.index)
+        write_varint(out, auth.count)
+        write_varint(out, len(auth.path))
+        for node in auth.path:
+            out += node
+    else:
+        _write_bytes(out, auth)
+    _write_bytes(out, mac)
+
+
+def decode_share(data, offset: int = 0) -> tuple:
+    """从 bytes/memoryview 解码一个份额，返回 (份额, 结束偏移)"""
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    view = view.toreadonly()
+    if len(view) - offset < _HEADER.size:
+        raise ValueError("份额数据被截断")
+    magic, version, flags, element_size = _HEADER.unpack_from(view, offset)
+    if magic != SHARE_MAGIC:
+        raise ValueError("不是份额数据")
+    if version not in _KNOWN_FLAGS:
+        raise ValueError(f"不支持的份额格式版本: {version}")
+    if flags & ~_KNOWN_FLAGS[version]:
+        raise ValueError(f"未知的份额标志位: {flags:#x}")
+    offset += _HEADER.size
+    x, offset = read_varint(view, offset)
+
+    if flags & FLAG_SEED:
+        count, offset = read_varint(view, offset)
+        end = offset + SEED_SIZE
+        if end > len(view):
+            raise ValueError("份额数据被截断")
+        y = SeededVector(bytes(view[offset:end]), count)
+    elif flags & FLAG_VECTOR:
+        count, offset = read_varint(view, offset)
+        end = offset + count * element_size
+        if end > len(view):
+            raise ValueError("份额数据被截断")
+        y = view[offset:end]
+    else:
+        end = offset + element_size
+        if end > len(view):
+            raise ValueError("份额数据被截断")
+        y = int.from_bytes(view[offset:end], "big")
+    offset = end
+
+    if flags & FLAG_MERKLE:
+        root = bytes(view[offset:offset + _DIGEST_SIZE])
+        signature, offset = _read_bytes(view, offset + _DIGEST_SIZE)
+        index, offset = read_varint(view, offset)
+        count, offset = read_varint(view, offset)
+        path_length, offset = read_varint(view, offset)
+        end = offset + path_length * _DIGEST_SIZE
+        if end > len(view):
+            raise ValueError("份额数据被截断")
+        path = [bytes(view[i:i + _DIGEST_SIZE]) for i in range(offset, end, _DIGEST_SIZE)]
+        auth = MerkleProof(root, bytes(signature), index, count, path)
+        offset = end
+    else:
+        auth, offset = _read_bytes(view, offset)
+    mac, offset = _read_bytes(view, offset)
+    return (x, y, auth, mac), offset
+
+
+def encode_batch(shares: list, element_size: int) -> bytes:
+    """把多个份额打包进一个缓冲区"""
+    out = bytearray(_HEADER.pack(BATCH_MAGIC, VERSION, 0, element_size))
+    write_varint(out, len(shares))
+    body = bytearray()
+    for share in shares:
+        body.clear()
+        encode_share_into(body, share, element_size)
+        write_varint(out, len(body))
+        out += body
+    return bytes(out)
+
+
+def iter_batch(data):
+    """逐个解码批量帧中的份额"""
+    view = (data if isinstance(data, memoryview) else memoryview(data)).toreadonly()
+    if len(view) < _HEADER.size:
+        raise ValueError("份额数据被截断")
+    magic, version, _, _ = _HEADER.unpack_from(view, 0)
+    if magic != BATCH_MAGIC:
+        raise ValueError("不是份额批量数据")
+    if version != VERSION:
+        raise ValueError(f"不支持的份额格式版本: {version}")
+    count, offset = read_varint(view, _HEADER.size)
+    for _ in range(count):
+        length, offset = read_varint(view, offset)
+        end = offset + length
+        if end > len(view):
+            raise ValueError("份额数据被截断")
+        share, _ = decode_share(view[offset:end])
+        yield share
+        offset = end
+
+
+def decode_batch(data) -> list:
+    return list(iter_batch(data))
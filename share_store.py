@@ -0,0 +1,180 @@
+"""列式、内存映射的份额存储
+
+每个参与方的份额向量按定长大端编码顺序写入 party_<x>.bin，文件内容即各分块的认证消息；
+index.json 记录轮次、元素宽度、参与方文件以及每个分块的偏移、长度、秘密编号和认证信息。
+重构时按分块内存映射读取，不需要把整个参数向量的份额载入内存。
+"""
+import json
+import mmap
+import os
+from merkle import MerkleProof
+from randomness import SeededVector
+
+INDEX_FILE = "index.json"
+
+
+def _auth_to_json(auth):
+    if isinstance(auth, MerkleProof):
+        return {"root": auth.root.hex(), "signature": bytes(auth.signature).hex(), "index": auth.index,
+                "count": auth.count, "path": [node.hex() for node in auth.path]}
+    return bytes(auth).hex()
+
+
+def _auth_from_json(data):
+    if isinstance(data, dict):
+        return MerkleProof(bytes.fromhex(data["root"]), bytes.fromhex(data["signature"]), data["index"],
+                           data["count"], [bytes.fromhex(node) for node in data["path"]])
+    return bytes.fromhex(data)
+
+
+class ShareStore:
+    """按参与方分文件、按分块追加的份额向量存储"""
+
+    def __init__(self, directory: str, element_size: int = None, round_id: int = 0):
+        self.directory = directory
+        self._maps = {}
+        index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+            if element_size is not None and element_size != self.index["element_size"]:
+                raise ValueError("元素宽度与已有份额存储不一致")
+        else:
+            if element_size is None:
+                raise ValueError("新建份额存储需要指定元素宽度")
+            os.makedirs(directory, exist_ok=True)
+            self.index = {"version": 1, "round": round_id, "element_size": element_size,
+                          "count": 0, "parties": {}, "chunks": []}
+
+    @property
+    def element_size(self) -> int:
+        return self.index["element_size"]
+
+    @property
+    def round_id(self) -> int:
+        return self.index["round"]
+
+    @property
+    def parties(self) -> list:
+        return sorted(int(x) for x in self.index["parties"])
+
+    def __len__(self) -> int:
+        return self.index["count"]
+
+    def append(self, share_vectors: list, secret_ids: list = None):
+        """追加一次 split_secrets 的输出作为一个分块"""
+        if not share_vectors:
+            return
+        size = self.element_size
+        count = self._element_count(share_vectors[0][1])
+        if secret_ids is not None and len(secret_ids) != count:
+            raise ValueError("秘密编号数量与份额向量长度不一致")
+        auth = {}
+        if any(isinstance(ys, SeededVector) for _, ys, _, _ in share_vectors):
+            raise ValueError("种子份额需先用 expand_share 展开后再写入份额存储")
+        for x, ys, sig, mac in share_vectors:
+            if self._element_count(ys) != count:
+                raise ValueError("份额向量长度不一致")
+            name = self.index["parties"].setdefault(str(x), f"party_{x}.bin")
+            self._release(x)
+            with open(os.path.join(self.directory, name), "ab") as f:
+                if isinstance(ys, (bytes, bytearray, memoryview)):
+                    f.write(ys)  # decode_shares 得到的定长编码字节视图，原样写入
+                else:
+                    f.write(b"".join([int(y).to_bytes(size, "big") for y in ys]))
+            auth[str(x)] = {"signature": _auth_to_json(sig), "mac": bytes(mac).hex()}
+        self.index["chunks"].append({"offset": self.index["count"], "count": count,
+                                     "secret_ids": list(secret_ids) if secret_ids is not None else None,
+                                     "auth": auth})
+        self.index["count"] += count
+        self._write_index()
+
+    def _element_count(self, ys) -> int:
+        if isinstance(ys, (bytes, bytearray, memoryview)):
+            if len(ys) % self.element_size:
+                raise ValueError("份额向量字节长度不是元素宽度的整数倍")
+            return len(ys) // self.element_size
+        return len(ys)
+
+    def split(self, shamir, secrets_vector, chunk_size: int = 65536, epsilon: float = None,
+              sensitivity: float = 1.0):
+        """按 chunk_size 分块调用 split_secrets 并逐块落盘，内存中只保留一个分块的份额"""
+        if shamir.element_size != self.element_size:
+            raise ValueError("方案模数与份额存储的元素宽度不一致")
+        if chunk_size < 1:
+            raise ValueError("分块大小必须为正整数")
+        chunk = []
+        for value in secrets_vector:
+            chunk.append(value)
+            if len(chunk) == chunk_size:
+                self.append(shamir.split_secrets(chunk, epsilon, sensitivity))
+                chunk = []
+        if chunk:
+            self.append(shamir.split_secrets(chunk, epsilon, sensitivity))
+
+    def _write_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, path)
+
+    def _map(self, x: int) -> memoryview:
+        view = self._maps.get(x)
+        if view is None:
+            path = os.path.join(self.directory, self.index["parties"][str(x)])
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = self._maps[x] = (mapped, memoryview(mapped))
+        return view[1]
+
+    def _release(self, x: int):
+        mapped = self._maps.pop(x, None)
+        if mapped is not None:
+            mapped[1].release()
+            mapped[0].close()
+
+    def close(self):
+        for x in list(self._maps):
+            self._release(x)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def iter_chunks(self, xs: list = None):
+        """逐块产出 (分块元信息, [(x, 内存映射字节段, 签名, mac), ...])"""
+        xs = self.parties if xs is None else xs
+        size = self.element_size
+        for chunk in self.index["chunks"]:
+            start = chunk["offset"] * size
+            end = start + chunk["count"] * size
+            share_vectors = []
+            for x in xs:
+                auth = chunk["auth"].get(str(x))
+                if auth is None:
+                    continue
+                share_vectors.append((x, self._map(x)[start:end], _auth_from_json(auth["signature"]),
+                                      bytes.fromhex(auth["mac"])))
+            yield chunk, share_vectors
+
+    def iter_reconstruct(self, shamir, xs: list = None):
+        """逐块重构，产出 (秘密编号或偏移区间, 秘密列表)"""
+        if shamir.element_size != self.element_size:
+            raise ValueError("方案模数与份额存储的元素宽度不一致")
+        for chunk, share_vectors in self.iter_chunks(xs):
+            ids = chunk["secret_ids"] if chunk["secret_ids"] is not None \
+                else range(chunk["offset"], chunk["offset"] + chunk["count"])
+            try:
+                yield ids, shamir.reconstruct_secrets(share_vectors)
+            finally:
+                for _, view, _, _ in share_vectors:
+                    view.release()
+
+    def reconstruct(self, shamir, xs: list = None) -> list:
+        result = []
+        for _, secrets in self.iter_reconstruct(shamir, xs):
+            result.extend(secrets)
+        return result
@@ -0,0 +1,179 @@
+"""可插拔的签名后端：Ed25519（默认）、ECDSA P-256、RSA-2048 PSS"""
+import threading
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa, padding as rsa_padding
+from cryptography.hazmat.backends import default_backend
+
+
+class Signer:
+    """签名/验签后端基类，私钥在第一次签名时才生成；只加载公钥时只能验签"""
+    name = None
+    private_key_type = None
+    public_key_type = None
+
+    def __init__(self, private_key=None, public_key=None):
+        self._private_key = private_key
+        self._public_key = public_key
+        self._lock = threading.Lock()
+
+    @property
+    def private_key(self):
+        if self._private_key is None:
+            with self._lock:
+                if self._private_key is None:
+                    if self._public_key is not None:
+                        raise ValueError("该实例只加载了公钥，无法签名")
+                    self._private_key = self._generate_private_key()
+        return self._private_key
+
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = self.private_key.public_key()
+        return self._public_key
+
+    @property
+    def has_private_key(self) -> bool:
+        return self._private_key is not None
+
+    def _generate_private_key(self):
+        raise NotImplementedError
+
+    def sign(self, message: bytes) -> bytes:
+        raise NotImplementedError
+
+    def verify(self, signature: bytes, message: bytes) -> bool:
+        try:
+            self._verify(signature, message)
+        except (InvalidSignature, TypeError, ValueError):
+            return False
+        return True
+
+    def _verify(self, signature: bytes, message: bytes):
+        raise NotImplementedError
+
+    def export_private_key(self, encoding: str = "PEM", password: bytes = None) -> bytes:
+        encryption = serialization.BestAvailableEncryption(password) if password \
+            else serialization.NoEncryption()
+        return self.private_key.private_bytes(
+            encoding=serialization.Encoding.PEM if encoding == "PEM" else serialization.Encoding.DER,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=encryption
+        )
+
+    def export_public_key(self, encoding: str = "PEM") -> bytes:
+        return self.public_key.public_bytes(
+            encoding=serialization.Encoding.PEM if encoding == "PEM" else serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+
+
+class Ed25519Signer(Signer):
+    """Ed25519：签名64字节，签名与验签都远快于RSA"""
+    name = "ed25519"
+    private_key_type = ed25519.Ed25519PrivateKey
+    public_key_type = ed25519.Ed25519PublicKey
+
+    def _generate_private_key(self):
+        return ed25519.Ed25519PrivateKey.generate()
+
+    def sign(self, message: bytes) -> bytes:
+        return self.private_key.sign(message)
+
+    def _verify(self, signature: bytes, message: bytes):
+        self.public_key.verify(signature, message)
+
+
+class ECDSASigner(Signer):
+    """ECDSA P-256 + SHA-256，DER编码签名约70字节"""
+    name = "ecdsa"
+    private_key_type = ec.EllipticCurvePrivateKey
+    public_key_type = ec.EllipticCurvePublicKey
+
+    def _generate_private_key(self):
+        return ec.generate_private_key(ec.SECP256R1(), backend=default_backend())
+
+    def sign(self, message: bytes) -> bytes:
+        return self.private_key.sign(message, ec.ECDSA(hashes.SHA256()))
+
+    def _verify(self, signature: bytes, message: bytes):
+        self.public_key.verify(signature, message, ec.ECDSA(hashes.SHA256()))
+
+
+class RSASigner(Signer):
+    """RSA-2048 PSS/MGF1-SHA256，与早期版本的份额格式兼容"""
+    name = "rsa"
+    private_key_type = rsa.RSAPrivateKey
+    public_key_type = rsa.RSAPublicKey
+
+    def _generate_private_key(self):
+        return rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=2048,
+            backend=default_backend()
+        )
+
+    @staticmethod
+    def _padding():
+        return rsa_padding.PSS(
+            mgf=rsa_padding.MGF1(algorithm=hashes.SHA256()),
+            salt_length=rsa_padding.PSS.MAX_LENGTH
+        )
+
+    def sign(self, message: bytes) -> bytes:
+        return self.private_key.sign(message, padding=self._padding(), algorithm=hashes.SHA256())
+
+    def _verify(self, signature: bytes, message: bytes):
+        self.public_key.verify(signature, message, padding=self._padding(), algorithm=hashes.SHA256())
+
+
+SIGNERS = {cls.name: cls for cls in (Ed25519Signer, ECDSASigner, RSASigner)}
+DEFAULT_SIGNER = "ed25519"
+
+
+def create_signer(name: str = DEFAULT_SIGNER) -> Signer:
+    if name not in SIGNERS:
+        raise ValueError(f"未知的签名后端: {name}，可选: {', '.join(SIGNERS)}")
+    return SIGNERS[name]()
+
+
+def _to_bytes(data) -> bytes:
+    return data.encode() if isinstance(data, str) else bytes(data)
+
+
+def signer_for_private_key(key, password: bytes = None) -> Signer:
+    """根据私钥（对象或 PEM/DER 字节）的类型选择签名后端"""
+    if isinstance(key, (bytes, bytearray, str)):
+        data = _to_bytes(key)
+        loader = serialization.load_pem_private_key if data.startswith(b"-----") \
+            else serialization.load_der_private_key
+        key = loader(data, password=password, backend=default_backend())
+    for cls in SIGNERS.values():
+        if isinstance(key, cls.private_key_type):
+            return cls(private_key=key)
+    raise ValueError(f"不支持的私钥类型: {type(key).__name__}")
+
+
+def signer_for_public_key(key) -> Signer:
+    """根据公钥（对象或 PEM/DER 字节）的类型构造只能验签的后端"""
+    if isinstance(key, (bytes, bytearray, str)):
+        data = _to_bytes(key)
+        loader = serialization.load_pem_public_key if data.startswith(b"-----") \
+            else serialization.load_der_public_key
+        key = loader(data, backend=default_backend())
+    for cls in SIGNERS.values():
+        if isinstance(key, cls.public_key_type):
+            return cls(public_key=key)
+    raise ValueError(f"不支持的公钥类型: {type(key).__name__}")
+
+
+_WORKER_SIGNERS = {}
+
+
+def verify_batch(public_key_der: bytes, items: list) -> list:
+    """进程池任务：用DER公钥批量验签 [(signature, message), ...]，返回布尔列表"""
+    signer = _WORKER_SIGNERS.get(public_key_der)
+    if signer is None:
+        signer = _WORKER_SIGNERS[public_key_der] = signer_for_public_key(public_key_der)
+    return [signer.verify(signature, message) for signature, message in items]
@@ -0,0 +1,75 @@
+"""小素数域快速路径：模数小于 2^31 或为 2^61-1 时，全部运算在 NumPy uint64 数组上向量化完成
+
+- p < 2^31：两数乘积小于 2^62，直接在 uint64 中相乘取模；
+- p = 2^61-1：把乘数拆成 32 位高低两半分别相乘，利用 2^61 ≡ 1 (mod p) 折叠，全程不溢出 uint64。
+系数由 randomness 模块批量生成。
+"""
+import numpy as np
+
+MERSENNE61 = (1 << 61) - 1
+_MASK32 = np.uint64(0xFFFFFFFF)
+_MASK29 = np.uint64((1 << 29) - 1)
+_M61 = np.uint64(MERSENNE61)
+
+
+def supports(modulus: int) -> bool:
+    """该模数能否走 uint64 快速路径"""
+    return modulus.bit_length() <= 31 or modulus == MERSENNE61
+
+
+def _fold61(value: np.ndarray) -> np.ndarray:
+    """x mod (2^61-1) 的一次折叠，结果小于 2^61 + 8"""
+    return (value & _M61) + (value >> np.uint64(61))
+
+
+def mulmod(a: np.ndarray, b, modulus: int) -> np.ndarray:
+    """逐元素 a·b mod p（a、b 已约化到 [0, p)）"""
+    b = np.uint64(b) if np.isscalar(b) else b
+    if modulus != MERSENNE61:
+        return a * b % np.uint64(modulus)
+    a1, a0 = a >> np.uint64(32), a & _MASK32
+    b1, b0 = b >> np.uint64(32), b & _MASK32
+    # a·b = a1b1·2^64 + (a1b0 + a0b1)·2^32 + a0b0，且 2^64 ≡ 8、2^61 ≡ 1
+    middle = a1 * b0 + a0 * b1
+    total = ((a1 * b1) << np.uint64(3)) + (middle >> np.uint64(29)) \
+        + ((middle & _MASK29) << np.uint64(32)) + _fold61(a0 * b0)
+    total = _fold61(total)
+    return np.where(total >= _M61, total - _M61, total)
+
+
+def addmod(a: np.ndarray, b: np.ndarray, modulus: int) -> np.ndarray:
+    total = a + b
+    p = np.uint64(modulus)
+    return np.where(total >= p, total - p, total)
+
+
+def evaluate(secrets: np.ndarray, coefficients: np.ndarray, xs, modulus: int) -> np.ndarray:
+    """秦九韶法一次求出所有参与方的份额矩阵 (len(xs), m)：f_x = S + Σ x^j·C_j"""
+    column = np.asarray(xs, dtype=np.uint64).reshape(-1, 1) % np.uint64(modulus)
+    acc = np.zeros((column.shape[0], secrets.shape[0]), dtype=np.uint64)
+    for row in coefficients[::-1]:
+        acc = mulmod(addmod(acc, np.broadcast_to(row, acc.shape), modulus), column, modulus)
+    return addmod(acc, np.broadcast_to(secrets, acc.shape), modulus)
+
+
+def combine(vectors: list, weights: list, modulus: int) -> np.ndarray:
+    """Σ w_i·V_i (mod p)，用于拉格朗日重构"""
+    result = np.zeros_like(vectors[0])
+    for vector, w in zip(vectors, weights):
+        result = addmod(result, mulmod(vector, int(w) % modulus, modulus), modulus)
+    return result
+
+
+def to_bytes(values: np.ndarray, element_size: int) -> bytes:
+    """定长大端编码，与大整数路径的份额消息逐字节相同"""
+    raw = values.astype(">u8").view(np.uint8).reshape(-1, 8)
+    return raw[:, 8 - element_size:].tobytes()
+
+
+def from_bytes(data, element_size: int) -> np.ndarray:
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if raw.size % element_size:
+        raise ValueError("份额向量字节长度不是元素宽度的整数倍")
+    padded = np.zeros((raw.size // element_size, 8), dtype=np.uint8)
+    padded[:, 8 - element_size:] = raw.reshape(-1, element_size)
+    return padded.view(">u8").reshape(-1).astype(np.uint64)
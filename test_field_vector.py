@@ -0,0 +1,71 @@
+import random
+import pytest
+from field_vector import FieldVector
+from primes import get_standard_prime
+from secret_sharing import ShamirSecretSharing
+
+
+@pytest.mark.parametrize("name", ["gf257", "mersenne61", "mersenne127", "modp2048"])
+def test_arithmetic_matches_python_ints(name):
+    p = get_standard_prime(name)
+    a = [random.randrange(p) for _ in range(50)] + [p - 1, 0]
+    b = [random.randrange(p) for _ in range(50)] + [p - 1, p - 1]
+    va, vb = FieldVector.from_ints(a, p), FieldVector.from_ints(b, p)
+    assert va.nbytes == len(a) * va.element_size
+    assert (va + vb).to_ints() == [(x + y) % p for x, y in zip(a, b)]
+    assert (va - vb).to_ints() == [(x - y) % p for x, y in zip(a, b)]
+    k = random.randrange(p)
+    assert (k * va).to_ints() == [k * x % p for x in a]
+    assert va.dot(b) == sum(x * y for x, y in zip(a, b)) % p
+    w = [random.randrange(p) for _ in range(3)]
+    combined = FieldVector.linear_combination([va, vb, va], w)
+    assert combined == [(w[0] * x + w[1] * y + w[2] * x) % p for x, y in zip(a, b)]
+
+
+@pytest.mark.parametrize("name", ["mersenne31", "mersenne61", "mersenne127", "mersenne521"])
+def test_mersenne_lane_fold_edge_values(name):
+    # 车道折叠后恰好等于 p、p+1 或最大累加值的情况都要约简到 [0, p)
+    p = get_standard_prime(name)
+    a = [p - 1, p - 1, 1, 0, 2, p - 2] + [random.randrange(p) for _ in range(30)]
+    b = [1, p - 1, p - 1, 0, p - 1, 3] + [random.randrange(p) for _ in range(30)]
+    va, vb = FieldVector.from_ints(a, p), FieldVector.from_ints(b, p)
+    assert (va + vb).to_ints() == [(x + y) % p for x, y in zip(a, b)]
+    weights = [p - 1] * 7
+    combined = FieldVector.linear_combination([va, vb] * 3 + [va], weights)
+    assert combined == [(p - 1) * (4 * x + 3 * y) % p for x, y in zip(a, b)]
+    assert combined.in_range()
+
+
+def test_lazy_access_and_buffer_roundtrip():
+    p = get_standard_prime("mersenne127")
+    values = list(range(p - 10, p))
+    vector = FieldVector.from_ints(values, p)
+    assert vector[3] == values[3] and vector[2:5].to_ints() == values[2:5]
+    restored = FieldVector.frombuffer(vector.tobytes(), p)
+    assert restored == vector and list(restored) == values
+    assert restored.in_range()
+    assert not FieldVector.frombuffer(b"\xff" * 16, p).in_range()
+    with pytest.raises(ValueError):
+        FieldVector.frombuffer(b"\x00" * 15, p)
+    with pytest.raises(ValueError):
+        vector + FieldVector.from_ints([1], p)
+
+
+@pytest.mark.parametrize("auth_mode", ["signature", "merkle", "mac"])
+def test_field_vector_as_share_type(auth_mode):
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, auth_mode=auth_mode, mac_algorithm="hmac-sha256")
+    secrets = [random.randrange(shamir.modulus) for _ in range(20)]
+    share_vectors = shamir.split_secrets(FieldVector.from_ints(secrets, shamir.modulus))
+    assert all(isinstance(ys, FieldVector) for _, ys, _, _ in share_vectors)
+    restored = shamir.reconstruct_secrets(share_vectors[1:4])
+    assert isinstance(restored, FieldVector) and restored == secrets
+
+    # 与列表形式的份额互通：同一份认证消息
+    as_lists = [(x, ys.to_ints(), sig, mac) for x, ys, sig, mac in share_vectors]
+    assert shamir.reconstruct_secrets(as_lists[:3]) == secrets
+
+    # 篡改一个元素后该份额被拒绝
+    x, ys, sig, mac = share_vectors[0]
+    tampered = (x, ys + FieldVector.from_ints([1] + [0] * 19, shamir.modulus), sig, mac)
+    with pytest.raises(ValueError):
+        shamir.reconstruct_secrets([tampered] + share_vectors[1:3])
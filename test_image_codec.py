@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from image_codec import int_to_pixels, pixels_to_int
+
+
+def _shift_encode(pixels, bits):
+    value = 0
+    for pixel in pixels:
+        value = (value << bits) | int(pixel)
+    return value
+
+
+@pytest.mark.parametrize("bits", [8, 7, 1, 3])
+def test_matches_per_pixel_shift_loop(bits):
+    rng = np.random.default_rng(0)
+    for count in (1, 7, 8, 9, 1001):
+        pixels = rng.integers(0, 2 ** bits, size=count, dtype=np.uint8)
+        value = pixels_to_int(pixels, bits)
+        assert value == _shift_encode(pixels, bits)
+        assert value.bit_length() <= count * bits
+        assert int_to_pixels(value, count, bits).tolist() == pixels.tolist()
+
+
+def test_decode_pads_and_truncates_like_legacy():
+    assert int_to_pixels(5, 4).tolist() == [0, 0, 0, 5]
+    assert int_to_pixels((9 << 16) | (1 << 8) | 2, 2).tolist() == [1, 2]  # 只保留低位的 count 个像素
+    assert int_to_pixels(0, 3, 7).tolist() == [0, 0, 0]
+
+
+def test_rejects_out_of_range_pixels():
+    with pytest.raises(ValueError):
+        pixels_to_int(np.array([128], dtype=np.uint8), 7)
+    with pytest.raises(ValueError):
+        pixels_to_int([1], 9)
@@ -0,0 +1,99 @@
+import itertools
+import numpy as np
+import pytest
+from PIL import Image
+import image_sharing
+from image_sharing import ImageSharing, _GF256_MUL
+
+
+def _random_image(mode, size=(37, 23)):
+    channels = {"L": (), "LA": (2,), "RGB": (3,), "RGBA": (4,)}[mode]
+    pixels = np.random.default_rng(1).integers(0, 256, size=(size[1], size[0]) + channels, dtype=np.uint8)
+    return Image.fromarray(pixels, mode)
+
+
+def test_gf256_multiplication_table():
+    assert _GF256_MUL[0x57, 0x83] == 0xC1  # FIPS-197 示例
+    assert _GF256_MUL[0x57, 0x13] == 0xFE
+    assert all(_GF256_MUL[a].tolist().count(1) == 1 for a in range(1, 256))
+
+
+@pytest.mark.parametrize("field", ["gf256", "gf257"])
+def test_any_threshold_subset_is_lossless(field):
+    sharing = ImageSharing(3, 5, field)
+    pixels = np.array(_random_image("RGB"))
+    shares = sharing.split_array(pixels)
+    assert [x for x, _ in shares] == [1, 2, 3, 4, 5]
+    assert all(share.shape == pixels.shape and share.dtype == sharing.share_dtype for _, share in shares)
+    for subset in itertools.combinations(shares, 3):
+        assert np.array_equal(sharing.reconstruct_array(list(subset)), pixels)
+    with pytest.raises(ValueError):
+        sharing.reconstruct_array(shares[:2])
+
+
+def test_extreme_pixels_and_threshold_one():
+    pixels = np.array([[0, 255], [255, 0]], dtype=np.uint8)
+    for field in ("gf256", "gf257"):
+        for t in (1, 2):
+            sharing = ImageSharing(t, 3, field)
+            shares = sharing.split_array(pixels)
+            assert np.array_equal(sharing.reconstruct_array(shares[-t:]), pixels)
+
+
+@pytest.mark.parametrize("field", ["gf256", "gf257"])
+@pytest.mark.parametrize("mode", ["L", "LA", "RGB", "RGBA"])
+def test_split_and_reconstruct_files(tmp_path, field, mode):
+    image = _random_image(mode)
+    source = tmp_path / "secret.png"
+    image.save(source)
+    sharing = ImageSharing(2, 4, field)
+    shares = sharing.split_image(str(source), str(tmp_path / "shares"))
+    suffix = ".png" if field == "gf256" else ".npy"
+    paths = [str(tmp_path / "shares" / f"share_{x}{suffix}") for x, _ in shares]
+    if field == "gf256":
+        with Image.open(paths[0]) as share_image:
+            assert share_image.size == image.size and share_image.mode == mode
+    output = tmp_path / "restored.png"
+    restored = sharing.reconstruct_image([paths[3], paths[1]], str(output))
+    assert restored.mode == mode
+    with Image.open(output) as restored_file:
+        assert np.array_equal(np.array(restored_file), np.array(image))
+
+
+@pytest.mark.parametrize("mode", ["I;16", "P", "CMYK", "1"])
+def test_unsupported_modes_rejected(tmp_path, mode):
+    image = Image.new(mode, (4, 4))
+    with pytest.raises(ValueError):
+        ImageSharing(2, 3).split_image(image)
+    if mode != "CMYK":
+        image.save(tmp_path / "secret.png")
+        with pytest.raises(ValueError):
+            ImageSharing(2, 3).split_image(str(tmp_path / "secret.png"))
+
+
+@pytest.mark.parametrize("field", ["gf256", "gf257"])
+def test_chunks_scale_with_party_count(monkeypatch, field):
+    assert ImageSharing(2, 64, field).chunk_size == image_sharing.CHUNK_SIZE // 64
+    monkeypatch.setattr(image_sharing, "CHUNK_SIZE", 50)
+    sharing = ImageSharing(3, 7, field)
+    pixels = np.random.default_rng(2).integers(0, 256, size=(9, 11, 3), dtype=np.uint8)
+    assert sharing.chunk_size == 7 and pixels.size % sharing.chunk_size  # 跨多个块且最后一块不满
+    assert np.array_equal(sharing.reconstruct_array(sharing.split_array(pixels)[4:]), pixels)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        ImageSharing(2, 3, "gf65537")
+    with pytest.raises(ValueError):
+        ImageSharing(4, 3)
+    with pytest.raises(ValueError):
+        ImageSharing(2, 256)
+    with pytest.raises(ValueError):
+        ImageSharing(2, 3).split_array(np.zeros(4, dtype=np.uint16))
+
+
+def test_mismatched_share_shapes_rejected():
+    sharing = ImageSharing(2, 3)
+    shares = sharing.split_array(np.zeros((4, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        sharing.reconstruct_array([shares[0], (2, shares[1][1][:2])])
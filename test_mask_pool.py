@@ -0,0 +1,46 @@
+import time
+import pytest
+from secret_sharing import ShamirSecretSharing
+
+
+def test_masks_are_zero_constant_polynomials():
+    shamir = ShamirSecretSharing(threshold=4, num_parties=7, modulus="mersenne127")
+    pool = shamir.enable_mask_pool(capacity=20, background=False)
+    assert len(pool) == 20
+    mask = pool.take()
+    points = list(zip(range(1, 8), mask))
+    assert ShamirSecretSharing._lagrange_interpolate(0, points[:4], shamir.modulus) == 0
+    assert ShamirSecretSharing._lagrange_interpolate(0, points[3:], shamir.modulus) == 0
+    assert len({tuple(pool.take()) for _ in range(10)}) == 10  # 每个掩码只用一次
+
+
+def test_online_split_uses_pool_and_reports_exhaustion():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    pool = shamir.enable_mask_pool(capacity=4, low_watermark=0, background=False)
+    for secret in range(6):
+        shares = shamir.split_secret(secret)
+        assert shamir.reconstruct_secret(shares[2:]) == secret
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"], stats["available"]) == (4, 2, 0)
+    assert stats["exhaustion_rate"] == pytest.approx(2 / 6)
+    assert shamir.reconstruct_secret(shamir.split_secret(9, strategy="matrix")[:3]) == 9
+    shamir.disable_mask_pool()
+    with pytest.raises(ValueError):
+        shamir.split_secret(1, strategy="mask")
+
+
+def test_background_refill():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus="mersenne61")
+    pool = shamir.enable_mask_pool(capacity=50, low_watermark=25, batch_size=10)
+    deadline = time.time() + 10
+    while len(pool) < 50 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(pool) == 50
+    for _ in range(40):
+        pool.take()
+    deadline = time.time() + 10
+    while len(pool) < 50 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(pool) == 50 and pool.stats()["refills"] >= 2
+    shamir.close()
+    assert shamir.mask_pool is None
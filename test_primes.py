@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from primes import (SMALL_PRIMES, PrimeCache, _sieve_window, generate_prime, get_standard_prime,
+                    is_probable_prime, select_standard_prime)
+
+
+def test_sieve_only_removes_composites():
+    start = (1 << 127) + 1
+    survivors = _sieve_window(start, 2000, safe=False)
+    assert 0 < len(survivors) < 2000 // 5  # 绝大多数候选被小素数筛掉
+    primes_in_window = [start + 2 * i for i in range(2000) if is_probable_prime(start + 2 * i, 8)]
+    assert set(primes_in_window) <= set(survivors)
+    assert all(c % q for c in survivors for q in SMALL_PRIMES[1:50])
+
+
+def test_generate_prime_bit_length():
+    for bits in (64, 256, 521):
+        p = generate_prime(bits)
+        assert p.bit_length() == bits
+        assert is_probable_prime(p)
+
+
+def test_generate_prime_small_bit_lengths():
+    # 位长不超过小素数表范围时，候选本身就是表中的素数，不能被筛掉
+    for bits in (16, 17, 24):
+        p = generate_prime(bits)
+        assert p.bit_length() == bits and is_probable_prime(p)
+        p = generate_prime(bits, safe=True)
+        assert p.bit_length() == bits and is_probable_prime(p) and is_probable_prime((p - 1) // 2)
+    assert 65521 in _sieve_window(65521, 4, safe=False)
+
+
+def test_generate_safe_prime():
+    p = generate_prime(256, safe=True)
+    assert p.bit_length() == 256
+    assert is_probable_prime(p) and is_probable_prime((p - 1) // 2)
+
+
+def test_generate_prime_with_process_pool():
+    p = generate_prime(256, workers=2)
+    assert p.bit_length() == 256 and is_probable_prime(p)
+
+
+def test_generate_prime_reuses_caller_pool():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        primes = [generate_prime(256, executor=pool), generate_prime(128, safe=True, executor=pool)]
+        assert pool.submit(pow, 2, 10).result() == 1024  # 调用方的池没有被关闭
+    assert [p.bit_length() for p in primes] == [256, 128]
+    assert all(is_probable_prime(p) for p in primes) and is_probable_prime((primes[1] - 1) // 2)
+
+
+def test_prime_cache_persists(tmp_path):
+    cache_path = str(tmp_path / "primes.json")
+    p = generate_prime(128, cache_path=cache_path)
+    assert PrimeCache(cache_path).get(128) == p
+    assert generate_prime(128, cache_path=cache_path) == p  # 命中磁盘缓存
+    assert PrimeCache(cache_path).get(128, safe=True) is None
+
+
+def test_registry_primes_are_prime():
+    assert is_probable_prime(get_standard_prime("modp2048"))
+    assert not is_probable_prime(get_standard_prime("modp2048") + 2)
+    with pytest.raises(ValueError):
+        generate_prime(8)
+
+
+def test_select_standard_prime():
+    assert select_standard_prime(8, 0) == "gf257"
+    assert select_standard_prime(32) == "mersenne89"
+    assert select_standard_prime(0, 0, min_value=300) == "mersenne31"
+    assert select_standard_prime(5000) is None
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from field_vector import FieldVector
+from primes import get_standard_prime
+from randomness import AESCTRRandom, RandomSource, SystemRandom, create_random_source, expand_seed
+from secret_sharing import ShamirSecretSharing
+
+
+@pytest.mark.parametrize("name", ["gf257", "mersenne61", "p256", "modp2048"])
+def test_field_elements_are_in_range(name):
+    modulus = get_standard_prime(name)
+    for source in (SystemRandom(buffer_size=1024), AESCTRRandom()):
+        values = source.field_elements(modulus, 3000)
+        assert len(values) == 3000 and all(0 <= v < modulus for v in values)
+        assert len(set(values)) > 200
+        assert FieldVector(source.field_bytes(modulus, 10), modulus).in_range()
+
+
+def test_rejection_sampling_is_uniform_over_small_field():
+    # 模数 257 截断到9位后约一半候选被拒绝，剩余元素应均匀落在 [0, 257)
+    counts = np.bincount(SystemRandom().field_array(257, (257 * 200,)).astype(np.int64), minlength=257)
+    assert counts.shape == (257,) and counts.min() > 100 and counts.max() < 320
+
+
+class _PatternSource(RandomSource):
+    """循环输出固定字节，用于构造与模数前缀相同的候选"""
+
+    def __init__(self, pattern: bytes):
+        super().__init__(buffer_size=len(pattern))
+        self.pattern = pattern
+
+    def _fill(self, n: int) -> bytes:
+        return (self.pattern * (n // len(self.pattern) + 1))[:n]
+
+
+def test_rejection_resolves_prefix_ties_bytewise():
+    # 前8字节与模数相同的候选要逐字节比较：m-1 接受，m 与 m+1 拒绝；最高字节先按模数位长截断
+    modulus = 0x7FFFFFFFFFFFFFFF00000000000000F0
+    candidates = [modulus + 1, modulus, modulus - 1 + (1 << 127), 5]
+    pattern = b"".join(c.to_bytes(16, "big") for c in candidates)
+    assert _PatternSource(pattern).field_elements(modulus, 6) == [modulus - 1, 5] * 3
+    assert _PatternSource(pattern).field_array(2 ** 61 - 1, (2,)).dtype == np.uint64
+
+
+def test_system_source_large_reads_are_fresh():
+    source = SystemRandom(buffer_size=1 << 16)
+    first, second = source.read(1 << 20), source.read(1 << 20)
+    assert len(first) == len(second) == 1 << 20 and first != second
+    counts = np.bincount(np.frombuffer(first, dtype=np.uint8), minlength=256)
+    assert counts.min() > 3500 and counts.max() < 4700  # 期望每个字节值 4096 次
+
+
+def test_aes_ctr_is_deterministic_per_seed():
+    seed = bytes(range(32))
+    a, b = AESCTRRandom(seed), AESCTRRandom(seed)
+    assert a.read(10) + a.read(100000) == b.read(100010)
+    assert AESCTRRandom(seed).field_elements(2 ** 127 - 1, 5) == AESCTRRandom(seed).field_elements(2 ** 127 - 1, 5)
+    assert AESCTRRandom().read(32) != AESCTRRandom().read(32)
+    assert expand_seed(seed, 2 ** 61 - 1, 50) == expand_seed(seed, 2 ** 61 - 1, 50, as_array=True).tolist()
+    with pytest.raises(ValueError):
+        AESCTRRandom(b"short")
+    with pytest.raises(ValueError):
+        create_random_source("mt19937")
+
+
+@pytest.mark.parametrize("source", ["system", "aes-ctr"])
+def test_every_split_path_uses_random_source(source):
+    for modulus in ("mersenne61", "mersenne127"):
+        shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus=modulus, random_source=source)
+        assert shamir.random_source.name == source
+        assert shamir.reconstruct_secret(shamir.split_secret(42)[1:4]) == 42
+        assert shamir.reconstruct_secrets(shamir.split_secrets([1, 2, 3])[:3]) == [1, 2, 3]
+        vector = FieldVector.from_ints([4, 5], shamir.modulus)
+        assert shamir.reconstruct_secrets(shamir.split_secrets(vector)[2:]) == vector
@@ -152,3 +152,378 @@ def test_massive_reconstruction_accuracy():
                         success += 1
     print(f"批量重构测试总次数: {total}, 成功次数: {success}, 成功率: {success/total:.2%}")
     assert success == total
+
+
+# 10. 向量化批量分割与重构
+def test_split_secrets_vector_roundtrip():
+    import numpy as np
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    params = [random.randint(0, 10**12) for _ in range(50)] + [0, shamir.modulus - 1]
+    share_vectors = shamir.split_secrets(params)
+    assert len(share_vectors) == 5
+    assert all(len(ys) == len(params) for _, ys, _, _ in share_vectors)
+    assert shamir.reconstruct_secrets(share_vectors[:3]) == params
+    assert shamir.reconstruct_secrets(share_vectors[2:]) == params
+
+    array = np.arange(20, dtype=np.int64)
+    share_vectors = shamir.split_secrets(array)
+    assert shamir.reconstruct_secrets(share_vectors[1:4]) == list(range(20))
+
+
+def test_split_secrets_rejects_tampered_vector():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    share_vectors = shamir.split_secrets([11, 22, 33])
+    x, ys, sig, mac = share_vectors[0]
+    tampered = (x, [ys[0], (ys[1] + 1) % shamir.modulus, ys[2]], sig, mac)
+    with pytest.raises(ValueError, match="有效份额不足"):
+        shamir.reconstruct_secrets([tampered] + share_vectors[1:3])
+    with pytest.raises(ValueError):
+        shamir.split_secrets([shamir.modulus])
+    with pytest.raises(ValueError):
+        shamir.split_secrets([-3])  # 负数不能被静默取模
+
+
+# 11. 拉格朗日系数缓存
+def test_lagrange_cache_hits_and_bound():
+    from secret_sharing import LagrangeCache
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    shamir.lagrange_cache.clear()
+    for secret in (5, 6, 7):
+        shares = shamir.split_secret(secret)
+        assert shamir.reconstruct_secret(shares[:3]) == secret
+    info = shamir.lagrange_cache.info()
+    assert info["misses"] == 1 and info["hits"] == 2
+
+    cache = LagrangeCache(maxsize=2)
+    for xs in ([1, 2], [1, 3], [2, 3]):
+        cache.get(97, xs, lambda ordered: [1] * len(ordered))
+    assert cache.info()["size"] == 2
+    cache.get(97, [3, 1], lambda ordered: [1] * len(ordered))
+    assert cache.hits == 1 and cache.misses == 3
+
+
+# 12. 小整数逆元表与批量求逆
+def test_inverse_table_and_batched_interpolation():
+    p = 2 ** 127 - 1
+    inverses = ShamirSecretSharing._batch_inverse(list(range(1, 21)), p)
+    assert all(k * inv % p == 1 for k, inv in zip(range(1, 21), inverses))
+
+    coefficients = [random.randrange(p) for _ in range(6)]
+    poly = lambda x: sum(c * pow(x, i, p) for i, c in enumerate(coefficients)) % p
+    xs = [2, 5, 9, 11, 17, 40]  # 40 超出逆元表范围，走批量求逆分支
+    table = [0] + inverses
+    weights = ShamirSecretSharing._lagrange_weights(xs, p, table)
+    assert sum(w * poly(x) for w, x in zip(weights, xs)) % p == coefficients[0]
+    points = [(x, poly(x)) for x in xs]
+    assert ShamirSecretSharing._lagrange_interpolate(3, points, p) == poly(3)
+
+
+# 13. 前向差分求值策略
+def test_difference_strategy_matches_matrix():
+    shamir = ShamirSecretSharing(threshold=4, num_parties=12)
+    secret = 97531
+    shares = shamir.split_secret(secret, strategy="difference")
+    assert [x for x, _, _, _ in shares] == list(range(1, 13))
+    assert shamir.reconstruct_secret(shares[5:9]) == secret
+
+    coefficients = [random.randrange(0, shamir.modulus) for _ in range(shamir.t - 1)]
+    expected = [(secret + sum(c * power for c, power in zip(coefficients, row))) % shamir.modulus
+                for row in shamir._power_matrix()]
+    assert shamir._evaluate_by_differences(secret, coefficients) == expected
+    with pytest.raises(ValueError):
+        shamir.split_secret(secret, strategy="unknown")
+
+
+# 14. 预置素数注册表
+def test_standard_prime_registry():
+    from primes import STANDARD_PRIMES, get_standard_prime
+    default = ShamirSecretSharing(threshold=3, num_parties=5)
+    assert default.modulus == STANDARD_PRIMES["modp2048"]
+    assert ShamirSecretSharing(3, 5, modulus="mersenne127").modulus == 2 ** 127 - 1
+    assert ShamirSecretSharing(3, 5, prime_bits=61).modulus == 2 ** 61 - 1
+    assert get_standard_prime(521) == 2 ** 521 - 1
+    for prime in STANDARD_PRIMES.values():
+        assert default._is_probable_prime(prime, k=8)
+    with pytest.raises(ValueError):
+        get_standard_prime(100)
+    with pytest.raises(ValueError):
+        ShamirSecretSharing(3, 300, modulus="gf257")
+
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus="mersenne61")
+    shares = shamir.split_secret(2 ** 60)
+    assert shamir.reconstruct_secret(shares[2:]) == 2 ** 60
+
+
+# 15. 延迟生成、可注入、可持久化的签名密钥
+def test_lazy_and_injectable_keys(tmp_path):
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    assert not shamir.signer.has_private_key  # 构造时不生成密钥
+    shares = shamir.split_secret(777)
+    assert shamir.signer.has_private_key
+
+    profile_path = str(tmp_path / "profile.json")
+    shamir.save_profile(profile_path)
+    verifier = ShamirSecretSharing.load_profile(profile_path)
+    assert verifier.modulus == shamir.modulus
+    assert verifier.reconstruct_secret(shares[:3]) == 777
+    with pytest.raises(ValueError):
+        verifier.split_secret(1)
+
+    signer = ShamirSecretSharing(3, 5, private_key=shamir.export_private_key(encoding="DER"))
+    assert shamir.reconstruct_secret(signer.split_secret(555)[1:4]) == 555
+
+    shamir.save_profile(profile_path, include_private_key=True, password=b"pw")
+    restored = ShamirSecretSharing.load_profile(profile_path, password=b"pw")
+    assert verifier.reconstruct_secret(restored.split_secret(42)[:3]) == 42
+
+
+# 16. Merkle树批量认证
+def test_merkle_auth_mode_single_signature():
+    from merkle import MerkleProof
+    shamir = ShamirSecretSharing(threshold=3, num_parties=8, auth_mode="merkle")
+    shares = shamir.split_secret(31415)
+    roots = {sig.root for _, _, sig, _ in shares}
+    assert len(roots) == 1 and all(isinstance(sig, MerkleProof) for _, _, sig, _ in shares)
+    assert shamir.reconstruct_secret(shares[4:7]) == 31415
+
+    # 篡改y值、挪用其他份额的证明都会被拒绝
+    x, y, sig, mac = shares[0]
+    tampered = (x, (y + 1) % shamir.modulus, sig, mac)
+    swapped = (shares[1][0], shares[1][1], sig, shares[1][3])
+    with pytest.raises(ValueError, match="有效份额不足"):
+        shamir.reconstruct_secret([tampered, swapped, shares[2], shares[3]])
+
+    forged_root = sig._replace(signature=b"fake_sig")
+    with pytest.raises(ValueError):
+        shamir.reconstruct_secret([(x, y, forged_root, mac)] + shares[1:3])
+
+    share_vectors = shamir.split_secrets([1, 2, 3])
+    assert shamir.reconstruct_secrets(share_vectors[-3:]) == [1, 2, 3]
+
+
+# 17. 可插拔签名后端
+def test_signature_backends_roundtrip():
+    for backend, max_sig_len in (("ed25519", 64), ("ecdsa", 72), ("rsa", 256)):
+        shamir = ShamirSecretSharing(threshold=3, num_parties=5, signature_backend=backend)
+        shares = shamir.split_secret(2468)
+        assert all(len(sig) <= max_sig_len for _, _, sig, _ in shares)
+        assert shamir.reconstruct_secret(shares[:3]) == 2468
+
+        verifier = ShamirSecretSharing(3, 5, public_key=shamir.export_public_key(encoding="DER"))
+        assert verifier.signature_backend == backend
+        x, y, sig, mac = shares[0]
+        with pytest.raises(ValueError):
+            verifier.reconstruct_secret([(x, y, b"fake_sig", mac)] + shares[1:3])
+    assert ShamirSecretSharing(3, 5).signature_backend == "ed25519"
+    with pytest.raises(ValueError):
+        ShamirSecretSharing(3, 5, signature_backend="dsa")
+
+
+# 18. 带密钥的参与方MAC
+def test_keyed_mac_modes(tmp_path):
+    for algorithm in ("hmac-sha256", "blake2b"):
+        shamir = ShamirSecretSharing(threshold=3, num_parties=5, mac_algorithm=algorithm)
+        shares = shamir.split_secret(1357)
+        assert shamir.reconstruct_secret(shares[:3]) == 1357
+        # 不同参与方的同一消息MAC不同，无密钥者无法重算
+        assert shamir._mac(1, b"1") != shamir._mac(2, b"1")
+        x, y, sig, _ = shares[0]
+        unkeyed = ShamirSecretSharing._hash_message(shamir._scalar_message(y))
+        with pytest.raises(ValueError):
+            shamir.reconstruct_secret([(x, y, sig, unkeyed)] + shares[1:3])
+        # 携带任意 x 的垃圾份额不会撑大参与方密钥缓存
+        junk = [(x, y, sig, b"\x00" * 32) for x in range(1000, 3000)]
+        shamir.verify_shares(junk)
+        assert set(shamir._party_mac_keys) <= set(range(1, 6))
+
+    # 可信聚合方：完全用MAC代替签名
+    dealer = ShamirSecretSharing(threshold=3, num_parties=5, auth_mode="mac", mac_algorithm="blake2b")
+    shares = dealer.split_secret(8642)
+    assert all(sig == b"" for _, _, sig, _ in shares)
+    profile_path = str(tmp_path / "mac_profile.json")
+    dealer.save_profile(profile_path, include_mac_key=True)
+    aggregator = ShamirSecretSharing.load_profile(profile_path)
+    assert aggregator.reconstruct_secret(shares[2:]) == 8642
+    other = ShamirSecretSharing(threshold=3, num_parties=5, auth_mode="mac", mac_algorithm="blake2b")
+    with pytest.raises(ValueError):
+        other.reconstruct_secret(shares)
+    with pytest.raises(ValueError):
+        ShamirSecretSharing(3, 5, auth_mode="mac")
+
+
+# 19. 按代价排序的份额校验与提前退出
+def test_validation_early_exit_and_background_audit():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=10)
+    shares = shamir.split_secret(97)
+    calls = []
+    verify = shamir._verify_share
+    shamir._verify_share = lambda x, message, sig: calls.append(x) or verify(x, message, sig)
+
+    assert shamir.reconstruct_secret(shares) == 97
+    assert calls == [1, 2, 3]  # 凑够t个后不再验签
+
+    # 结构错误、越界、重复x在验签之前就被过滤
+    calls.clear()
+    junk = [None, (1, 2), ("x", 1, b"", b""), (0, 1, b"", b""), (4, -1, b"", b""), shares[0], shares[0]]
+    assert shamir.reconstruct_secret(junk + shares[1:3]) == 97
+    assert calls == [1, 2, 3]
+
+    # 伪造的同x份额不会挡住后面的真实份额
+    x, y, sig, mac = shares[3]
+    forged = (x, y, b"fake_sig", mac)
+    assert shamir.reconstruct_secret([forged, shares[3], shares[4], shares[5]]) == 97
+
+    bad = (shares[9][0], shares[9][1], b"fake_sig", shares[9][3])
+    assert shamir.reconstruct_secret(shares[:8] + [bad], audit=True) == 97
+    assert shamir.last_audit.result(timeout=10) == [bad]
+
+
+# 20. 并行批量验签
+def test_parallel_verify_shares():
+    for executor in ("thread", "process"):
+        shamir = ShamirSecretSharing(threshold=3, num_parties=8, verify_workers=2, verify_executor=executor)
+        shares = shamir.split_secret(4321)
+        x, y, sig, mac = shares[2]
+        forged = (x, y, b"fake_sig", mac)
+        batch = shares[:2] + [forged] + shares[3:] + [("bad",)]
+        assert shamir.verify_shares(batch) == [True, True, False] + [True] * 5 + [False]
+        assert shamir.reconstruct_secret([forged] + shares[3:]) == 4321
+
+        share_vectors = shamir.split_secrets([5, 6, 7])
+        assert all(shamir.verify_shares(share_vectors))
+        assert shamir.reconstruct_secrets(share_vectors[4:]) == [5, 6, 7]
+        shamir.close()
+
+
+# 21. 规范定长二进制编码
+def test_canonical_fixed_width_encoding():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    assert shamir.element_size == 256
+    for y in (0, 1, shamir.modulus - 1):
+        encoded = shamir.encode_element(y)
+        assert len(encoded) == 256 and shamir.decode_element(encoded) == y
+    assert shamir._vector_message([1, 2]) == (1).to_bytes(256, "big") + (2).to_bytes(256, "big")
+
+    shares = shamir.split_secret(2024)
+    x, y, sig, mac = shares[0]
+    assert shamir.signer.verify(sig, shamir.encode_element(y))
+    assert mac == ShamirSecretSharing._hash_message(shamir.encode_element(y))
+    assert ShamirSecretSharing(3, 5, modulus="mersenne61").element_size == 8
+
+
+# 22. 按载荷大小自适应选择素数域
+def test_adaptive_field_sizing():
+    weight = ShamirSecretSharing.for_payload(3, 5, payload_bits=32)
+    assert weight.modulus == 2 ** 89 - 1 and weight.element_size == 12
+    text = "短文本秘密"
+    secret = ShamirSecretSharing.encode_text_secret(text)
+    shamir = ShamirSecretSharing.for_payload(3, 5, payload_bits=secret.bit_length(), margin_bits=0)
+    assert shamir.modulus.bit_length() < 2048
+    assert shamir.reconstruct_secret(shamir.split_secret(secret)[:3]) == secret
+
+    # 超过所有预置域的秘密自动拆成多个域元素
+    big = ShamirSecretSharing.for_payload(3, 5, payload_bits=5000)
+    assert big.modulus.bit_length() == 2048
+    secret = random.getrandbits(5000)
+    share_vectors = big.split_payload(secret)
+    assert len(share_vectors[0][1]) == 3
+    assert big.reconstruct_payload(share_vectors[2:]) == secret
+    # 份额向量长度由载荷位宽决定，小秘密补零，不泄露秘密大小
+    assert len(big.split_payload(1)[0][1]) == 3
+    assert big.reconstruct_payload(big.split_payload(1)[:3]) == 1
+    with pytest.raises(ValueError):
+        big.split_payload(1 << 5000)
+    with pytest.raises(ValueError):
+        ShamirSecretSharing(3, 5).split_payload(1)  # 未指定载荷位数
+
+    # 余量位吸收多方求和时的进位
+    small = ShamirSecretSharing.for_payload(2, 3, payload_bits=100, margin_bits=8, auth_mode="mac",
+                                            mac_algorithm="blake2b")
+    secrets = [random.getrandbits(300) for _ in range(4)]
+    chunks = [0] * len(small.split_payload(secrets[0], payload_bits=300)[0][1])
+    for secret in secrets:
+        vector = small.split_payload(secret, payload_bits=300)
+        chunks = [(a + b) % small.modulus for a, b in zip(chunks, small.reconstruct_secrets(vector[:2]))]
+    width = small.payload_chunk_bits
+    assert sum(c << (i * width) for i, c in enumerate(chunks)) == sum(secrets)
+    with pytest.raises(ValueError):
+        ShamirSecretSharing(2, 3, modulus="gf257").split_payload(1, payload_bits=8)
+
+
+# 23. 打包秘密共享
+@pytest.mark.parametrize("modulus", ["mersenne61", "mersenne127"])
+def test_packed_secret_sharing(modulus):
+    shamir = ShamirSecretSharing(threshold=3, num_parties=10, modulus=modulus, auth_mode="merkle")
+    secrets = [random.randrange(shamir.modulus) for _ in range(23)]
+    share_vectors = shamir.split_packed(secrets, k=4)
+    assert len(share_vectors) == 10 and len(share_vectors[0][1]) == 6  # ceil(23/4)
+
+    # 任意 t+k-1 = 6 个份额给出同一结果，插值矩阵被复用
+    assert shamir.reconstruct_packed(share_vectors[:6], k=4, count=23) == secrets
+    assert shamir.reconstruct_packed(share_vectors[4:], k=4, count=23) == secrets
+    assert shamir.reconstruct_packed(share_vectors[4:], k=4, count=23) == secrets
+    assert ("reconstruct", 4, tuple(range(5, 11))) in shamir._interpolation_matrices
+
+    with pytest.raises(ValueError):
+        shamir.reconstruct_packed(share_vectors[:5], k=4)
+    x, ys, sig, mac = share_vectors[0]
+    tampered = (x, [ys[0] ^ 1] + ys[1:], sig, mac)
+    assert shamir.reconstruct_packed([tampered] + share_vectors[1:7], k=4, count=23) == secrets
+    with pytest.raises(ValueError):
+        shamir.split_packed(secrets, k=9)  # t+k-1 > n
+
+
+def test_packed_k1_matches_scalar_degree():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    share_vectors = shamir.split_packed([7, 8], k=1)
+    points = [(x, ys[0]) for x, ys, _, _ in share_vectors]
+    assert ShamirSecretSharing._lagrange_interpolate(0, points[:3], shamir.modulus) == 7
+    assert shamir.reconstruct_packed(share_vectors[2:], k=1) == [7, 8]
+
+
+# 24. 种子压缩分割
+@pytest.mark.parametrize("modulus", ["mersenne61", "mersenne127"])
+def test_seeded_split(modulus):
+    from randomness import SeededVector
+    shamir = ShamirSecretSharing(threshold=3, num_parties=6, modulus=modulus)
+    secrets = [random.randrange(shamir.modulus) for _ in range(200)]
+    share_vectors = shamir.split_seeded(secrets)
+    assert [isinstance(ys, SeededVector) for _, ys, _, _ in share_vectors] == [True, True] + [False] * 4
+    assert len(share_vectors[0][1].seed) == 32 and share_vectors[0][1].length == 200
+    assert len(share_vectors[0][1]) == 200  # len() 是展开后的元素个数，而不是 (种子, 长度) 二元组
+    assert all(shamir.verify_shares(share_vectors))
+
+    # 种子份额与普通份额任意组合都能重构
+    for subset in (share_vectors[:3], share_vectors[3:], [share_vectors[0], share_vectors[4], share_vectors[5]]):
+        assert list(shamir.reconstruct_secrets(subset)) == secrets
+    expanded = shamir.expand_share(share_vectors[1])
+    assert len(expanded[1]) == 200 and shamir.reconstruct_secrets([expanded] + share_vectors[4:]) == secrets
+
+    # 篡改种子后签名校验失败
+    x, ys, sig, mac = share_vectors[0]
+    forged = (x, SeededVector(bytes(32), ys.length), sig, mac)
+    assert shamir.verify_shares([forged]) == [False]
+    with pytest.raises(ValueError):
+        shamir.reconstruct_secrets([forged] + share_vectors[1:3])
+
+
+# 25. 图片整数编码（线性时间编解码）
+@pytest.mark.parametrize("pixel_bits", [8, 7])
+def test_image_secret_roundtrip_through_codec(tmp_path, pixel_bits):
+    import numpy as np
+    from PIL import Image
+    pixels = np.random.default_rng(3).integers(0, 256, size=(12, 15), dtype=np.uint8)
+    path = str(tmp_path / "secret.png")
+    Image.fromarray(pixels, mode="L").save(path)
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    secret, _, shape = shamir.encode_image_secret(path, pixel_bits=pixel_bits)
+    with Image.open(str(tmp_path / "secret_compressed.png")) as compressed:
+        encoded = np.array(compressed)
+    # 与旧版逐像素移位编码一致（pixel_bits=8 为默认值）
+    legacy = 0
+    for pixel in encoded.flatten():
+        legacy = (legacy << pixel_bits) | int(pixel)
+    assert shape == (12, 15) and secret == (legacy or 1)
+    restored = shamir.reconstruct_secret(shamir.split_secret(secret)[2:])
+    image = shamir.decode_compressed_image(restored, shape=shape, pixel_bits=pixel_bits)
+    assert np.array_equal(np.array(image), encoded.astype(np.uint16) * 2)
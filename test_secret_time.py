@@ -114,6 +114,249 @@ class TestShamirSecretSharingPerformance:
 
 
 
+    def test_power_matrix_evaluation_speedup(self):
+        """测试缓存幂矩阵求值相对逐项pow求值的加速"""
+        shamir = ShamirSecretSharing(threshold=10, num_parties=100)
+        secret = 123456
+        coefficients = [random.randrange(0, shamir.modulus) for _ in range(shamir.t - 1)]
+        shamir._power_matrix()  # 预热缓存
+
+        def pow_evaluation():
+            return [(secret + sum(c * pow(x, i + 1, shamir.modulus) for i, c in enumerate(coefficients)))
+                    % shamir.modulus for x in range(1, shamir.n + 1)]
+
+        def matrix_evaluation():
+            return [(secret + sum(c * power for c, power in zip(coefficients, row))) % shamir.modulus
+                    for row in shamir._power_matrix()]
+
+        assert pow_evaluation() == matrix_evaluation()
+        pow_time = timeit.timeit(pow_evaluation, number=50) / 50
+        matrix_time = timeit.timeit(matrix_evaluation, number=50) / 50
+        print(f"[100参与方] 逐项pow求值: {pow_time:.6f}s, 幂矩阵求值: {matrix_time:.6f}s, "
+              f"加速比: {pow_time / matrix_time:.2f}x")
+
+        # 批量：500个秘密一次矩阵乘法
+        values = [random.randrange(0, shamir.modulus) for _ in range(500)]
+        batch_coefficients = [[random.randrange(0, shamir.modulus) for _ in values] for _ in range(shamir.t - 1)]
+        start = time.time()
+        shamir._evaluate_shares(values, batch_coefficients)
+        print(f"[100参与方] 500个秘密批量求值耗时: {time.time() - start:.4f}s")
+
+    def test_forward_difference_large_parties(self):
+        """测试1k~10k参与方时前向差分相对逐项pow求值的性能"""
+        for n in (1000, 10000):
+            shamir = ShamirSecretSharing(threshold=10, num_parties=n)
+            secret = random.randrange(0, shamir.modulus)
+            coefficients = [random.randrange(0, shamir.modulus) for _ in range(shamir.t - 1)]
+
+            start = time.time()
+            expected = [(secret + sum(c * pow(x, i + 1, shamir.modulus) for i, c in enumerate(coefficients)))
+                        % shamir.modulus for x in range(1, n + 1)]
+            pow_time = time.time() - start
+
+            start = time.time()
+            ys = shamir._evaluate_by_differences(secret, coefficients)
+            difference_time = time.time() - start
+
+            assert ys == expected
+            print(f"[{n}参与方] 逐项pow求值: {pow_time:.4f}s, 前向差分: {difference_time:.4f}s, "
+                  f"加速比: {pow_time / difference_time:.1f}x")
+
+    def test_signature_backend_throughput(self):
+        """比较各签名后端的分割/重构吞吐量与份额大小"""
+        for backend in ("ed25519", "ecdsa", "rsa"):
+            shamir = ShamirSecretSharing(threshold=5, num_parties=20, signature_backend=backend)
+            shamir.split_secret(1)  # 预热：生成密钥
+            secret = random.randrange(0, shamir.modulus)
+
+            split_time = timeit.timeit(lambda: shamir.split_secret(secret), number=5) / 5
+            shares = shamir.split_secret(secret)
+            reconstruct_time = timeit.timeit(lambda: shamir.reconstruct_secret(shares[:5]), number=5) / 5
+            sig_size = len(shares[0][2])
+            print(f"[{backend}] 分割: {shamir.n / split_time:.0f} 份额/s, "
+                  f"重构: {1 / reconstruct_time:.1f} 次/s, 签名大小: {sig_size} 字节")
+            assert shamir.reconstruct_secret(shares[:5]) == secret
+
+    def test_parallel_verification_throughput(self):
+        """测试批量验签吞吐量随工作线程数的变化"""
+        dealer = ShamirSecretSharing(threshold=5, num_parties=200, signature_backend="ecdsa")
+        shares = dealer.split_secret(random.randrange(0, dealer.modulus))
+        for workers in (1, 2, 4, os.cpu_count() or 1):
+            verifier = ShamirSecretSharing(threshold=5, num_parties=200, verify_workers=workers,
+                                           public_key=dealer.export_public_key())
+            start = time.time()
+            mask = verifier.verify_shares(shares)
+            elapsed = time.time() - start
+            verifier.close()
+            assert all(mask)
+            print(f"[{workers}线程] 验签吞吐量: {len(shares) / elapsed:.0f} 份额/s")
+
+    def test_field_vector_memory_and_speed(self):
+        """比较 FieldVector 与 int 列表作为批量份额类型时的内存占用和分割/重构耗时；
+        梅森素数模数的车道取模按车道折叠，大的一般模数下 FieldVector 主要节省内存"""
+        import sys
+        from field_vector import FieldVector
+        for modulus, count in (("mersenne127", 20000), ("modp2048", 2000)):
+            shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus=modulus, auth_mode="mac",
+                                         mac_algorithm="blake2b")
+            secrets = [random.randrange(0, shamir.modulus) for _ in range(count)]
+            vector = FieldVector.from_ints(secrets, shamir.modulus)
+            list_bytes = sys.getsizeof(secrets) + sum(sys.getsizeof(s) for s in secrets)
+            print(f"[{modulus}] int列表: {list_bytes / 1024:.0f} KiB, FieldVector: {vector.nbytes / 1024:.0f} KiB")
+            assert vector.nbytes < list_bytes
+
+            for name, data in (("int列表", secrets), ("FieldVector", vector)):
+                split_time = min(timeit.repeat(lambda: shamir.split_secrets(data), number=1, repeat=3))
+                share_vectors = shamir.split_secrets(data)
+                start = time.time()
+                restored = shamir.reconstruct_secrets(share_vectors[:3])
+                reconstruct_time = time.time() - start
+                assert restored == secrets
+                print(f"[{modulus} {name}] 分割: {split_time:.3f}s, 重构: {reconstruct_time:.3f}s")
+
+    def test_small_field_throughput(self):
+        """比较小素数域 uint64 快速路径与大整数路径的批量分割/重构吞吐量（参数/秒）"""
+        import numpy as np
+        count = 100000
+        for name in ("mersenne31", "mersenne61", "mersenne127"):
+            shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus=name, auth_mode="mac",
+                                         mac_algorithm="blake2b")
+            secrets = np.random.randint(0, 2 ** 30, size=count, dtype=np.uint64)
+            data = secrets if shamir.small_field else secrets.tolist()
+            start = time.time()
+            share_vectors = shamir.split_secrets(data)
+            split_time = time.time() - start
+            start = time.time()
+            restored = shamir.reconstruct_secrets(share_vectors[:3])
+            reconstruct_time = time.time() - start
+            assert list(restored) == secrets.tolist()
+            path = "uint64" if shamir.small_field else "大整数"
+            print(f"[{name} {path}] 分割: {count / split_time:,.0f} 参数/s, "
+                  f"重构: {count / reconstruct_time:,.0f} 参数/s")
+
+    def test_bulk_coefficient_generation(self):
+        """比较逐个 random.randrange 与缓冲CSPRNG/AES-CTR批量拒绝采样生成系数的速度"""
+        from randomness import AESCTRRandom, SystemRandom
+        count = 20000
+        for name in ("mersenne61", "modp2048"):
+            shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus=name)
+            start = time.time()
+            [random.randrange(0, shamir.modulus) for _ in range(count)]
+            baseline = time.time() - start
+            for source in (SystemRandom(), AESCTRRandom()):
+                start = time.time()
+                values = source.field_elements(shamir.modulus, count)
+                elapsed = time.time() - start
+                assert len(values) == count
+                print(f"[{name} {source.name}] randrange: {baseline:.4f}s, 批量采样: {elapsed:.4f}s, "
+                      f"加速比: {baseline / elapsed:.1f}x")
+
+    def test_mask_pool_online_latency(self):
+        """比较直接分割与使用预计算掩码池的在线分割延迟"""
+        shamir = ShamirSecretSharing(threshold=10, num_parties=100, auth_mode="mac", mac_algorithm="blake2b")
+        secret = random.randrange(0, shamir.modulus)
+        direct = timeit.timeit(lambda: shamir.split_secret(secret), number=50) / 50
+        shamir.enable_mask_pool(capacity=50, background=False)
+        online = timeit.timeit(lambda: shamir.split_secret(secret), number=50) / 50
+        stats = shamir.mask_pool.stats()
+        shamir.close()
+        assert stats["misses"] == 0
+        print(f"[10-of-100] 直接分割: {direct * 1000:.2f}ms, 掩码池在线分割: {online * 1000:.2f}ms, "
+              f"加速比: {direct / online:.1f}x")
+
+    def test_packed_sharing_volume_and_speed(self):
+        """比较逐个分割与打包分割（k个秘密/多项式）的份额体积与耗时"""
+        shamir = ShamirSecretSharing(threshold=5, num_parties=20, auth_mode="mac", mac_algorithm="blake2b")
+        secrets = [random.randrange(0, shamir.modulus) for _ in range(512)]
+        plain = shamir.split_secrets(secrets)
+        plain_time = timeit.timeit(lambda: shamir.split_secrets(secrets), number=5) / 5
+        for k in (4, 8, 16):
+            packed = shamir.split_packed(secrets, k)
+            assert shamir.reconstruct_packed(packed, k, count=len(secrets)) == secrets
+            split_time = timeit.timeit(lambda: shamir.split_packed(secrets, k), number=5) / 5
+            reconstruct_time = timeit.timeit(lambda: shamir.reconstruct_packed(packed, k), number=5) / 5
+            print(f"[k={k}] 份额元素: {len(packed[0][1])} vs {len(plain[0][1])}, "
+                  f"分割: {split_time:.4f}s vs {plain_time:.4f}s, 重构({shamir.t + k - 1}份): {reconstruct_time:.4f}s")
+
+    def test_seeded_split_upload_size(self):
+        """比较普通分割与种子压缩分割时分发方需要上传的字节数"""
+        secrets = [random.randrange(0, 2 ** 60) for _ in range(10000)]
+        for t, n in ((3, 5), (10, 20), (15, 20)):
+            shamir = ShamirSecretSharing(threshold=t, num_parties=n, modulus="mersenne127", auth_mode="merkle")
+            plain = len(shamir.encode_shares(shamir.split_secrets(secrets)))
+            start = time.time()
+            seeded_shares = shamir.split_seeded(secrets)
+            split_time = time.time() - start
+            seeded = len(shamir.encode_shares(seeded_shares))
+            print(f"[{t}-of-{n}] 普通: {plain / 1024:.0f} KiB, 种子压缩: {seeded / 1024:.0f} KiB, "
+                  f"节省: {1 - seeded / plain:.0%}（理论 {(t - 1) / n:.0%}），分割耗时: {split_time:.3f}s")
+            assert seeded < plain
+
+    def test_image_codec_linear_time(self):
+        """比较逐像素移位循环与 from_bytes/packbits 编解码在 100×100 及更大图像上的耗时"""
+        import numpy as np
+        from image_codec import int_to_pixels, pixels_to_int
+        for side in (100, 300, 1000):
+            pixels = np.random.randint(0, 128, size=side * side, dtype=np.uint8)
+            for bits in (8, 7):
+                start = time.time()
+                value = pixels_to_int(pixels, bits)
+                encode_time = time.time() - start
+                start = time.time()
+                decoded = int_to_pixels(value, pixels.size, bits)
+                decode_time = time.time() - start
+                assert np.array_equal(decoded, pixels)
+                print(f"[{side}×{side} {bits}位] 编码: {encode_time * 1000:.2f}ms, 解码: {decode_time * 1000:.2f}ms, "
+                      f"整数位长: {value.bit_length()}")
+            if side <= 300:
+                start = time.time()
+                legacy = 0
+                for pixel in pixels:
+                    legacy = (legacy << 8) | int(pixel)
+                loop_time = time.time() - start
+                assert legacy == pixels_to_int(pixels, 8)
+                print(f"[{side}×{side}] 旧逐像素移位编码: {loop_time * 1000:.2f}ms")
+
+    def test_full_resolution_image_sharing(self):
+        """2000×1500 RGB 照片逐像素共享的分割与无损重构耗时"""
+        import numpy as np
+        from image_sharing import ImageSharing
+        pixels = np.random.randint(0, 256, size=(1500, 2000, 3), dtype=np.uint8)
+        for field in ("gf256", "gf257"):
+            sharing = ImageSharing(threshold=3, num_parties=5, field=field)
+            start = time.time()
+            shares = sharing.split_array(pixels)
+            split_time = time.time() - start
+            start = time.time()
+            restored = sharing.reconstruct_array(shares[2:])
+            reconstruct_time = time.time() - start
+            assert np.array_equal(restored, pixels)
+            print(f"[{field} 3-of-5 {pixels.shape[1]}×{pixels.shape[0]}] 分割: {split_time:.2f}s, "
+                  f"重构: {reconstruct_time:.2f}s, {pixels.size / split_time / 1e6:.1f} M通道值/s")
+
+    def test_prime_generation_pool(self):
+        """串行、每次新建进程池、复用长期进程池三种方式生成1024位素数的耗时"""
+        from concurrent.futures import ProcessPoolExecutor
+        from primes import generate_prime
+        workers = max(2, min(4, os.cpu_count() or 1))
+        runs = 5
+        start = time.time()
+        for _ in range(runs):
+            generate_prime(1024)
+        serial = (time.time() - start) / runs
+        start = time.time()
+        for _ in range(runs):
+            generate_prime(1024, workers=workers)
+        per_call = (time.time() - start) / runs
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            generate_prime(256, executor=pool)  # 预热：进程已启动
+            start = time.time()
+            for _ in range(runs):
+                assert generate_prime(1024, executor=pool).bit_length() == 1024
+            shared = (time.time() - start) / runs
+        print(f"[1024位, {workers}进程, CPU {os.cpu_count()}] 串行: {serial:.3f}s, "
+              f"每次新建进程池: {per_call:.3f}s, 复用进程池: {shared:.3f}s")
+
     # 辅助方法
     def _calculate_max_bytes(self, shamir):
         """计算模数安全字节长度"""
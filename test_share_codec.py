@@ -0,0 +1,77 @@
+import pickle
+import pytest
+from secret_sharing import ShamirSecretSharing
+from share_codec import decode_share, encode_share, read_varint, write_varint
+
+
+def test_varint_roundtrip():
+    for value in (0, 1, 127, 128, 300, 2 ** 32, 2 ** 70):
+        out = bytearray()
+        write_varint(out, value)
+        assert read_varint(memoryview(bytes(out)), 0) == (value, len(out))
+
+
+def test_scalar_share_roundtrip_and_zero_copy():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    shares = shamir.split_secret(123456789)
+    data = encode_share(shares[0], shamir.element_size)
+    decoded, end = decode_share(data)
+    assert end == len(data)
+    x, y, sig, mac = decoded
+    assert (x, y) == shares[0][:2]
+    assert isinstance(sig, memoryview) and sig.obj is data  # 直接引用输入缓冲区
+    assert bytes(sig) == shares[0][2] and bytes(mac) == shares[0][3]
+
+    frame = shamir.encode_shares(shares)
+    assert len(frame) < len(pickle.dumps(shares))
+    restored = shamir.decode_shares(frame)
+    assert shamir.reconstruct_secret(restored[2:]) == 123456789
+
+
+def test_vector_and_merkle_shares_roundtrip():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, auth_mode="merkle", modulus="mersenne127")
+    share_vectors = shamir.split_secrets(list(range(100)))
+    restored = shamir.decode_shares(memoryview(shamir.encode_shares(share_vectors)))
+    assert all(isinstance(ys, memoryview) for _, ys, _, _ in restored)  # 向量不逐元素解码
+    assert [shamir.decode_vector(ys) for _, ys, _, _ in restored] == [ys for _, ys, _, _ in share_vectors]
+    assert shamir.decode_shares(shamir.encode_shares(restored))[0][1] == restored[0][1]
+    assert restored[0][2] == share_vectors[0][2]
+    assert shamir.reconstruct_secrets(restored[:3]) == list(range(100))
+
+
+def test_decoded_shares_verify_in_process_pool():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, verify_workers=2, verify_executor="process")
+    try:
+        restored = shamir.decode_shares(shamir.encode_shares(shamir.split_secret(4242)))
+        assert shamir.verify_shares(restored) == [True] * 5
+        assert shamir.reconstruct_secret(restored) == 4242
+        vectors = shamir.decode_shares(shamir.encode_shares(shamir.split_secrets([1, 2, 3])))
+        assert shamir.verify_shares(vectors) == [True] * 5
+        assert shamir.reconstruct_secrets(vectors) == [1, 2, 3]
+    finally:
+        shamir.close()
+
+
+def test_truncated_or_foreign_data_rejected():
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5)
+    data = encode_share(shamir.split_secret(5)[0], shamir.element_size)
+    with pytest.raises(ValueError):
+        decode_share(data[:-3])
+    with pytest.raises(ValueError):
+        decode_share(b"XX" + data[2:])
+    with pytest.raises(ValueError):
+        shamir.decode_shares(data)
+
+
+def test_seeded_shares_roundtrip_and_shrink():
+    shamir = ShamirSecretSharing(threshold=4, num_parties=6, modulus="mersenne127")
+    secrets = list(range(500))
+    seeded = shamir.split_seeded(secrets)
+    data = encode_share(seeded[0], shamir.element_size)
+    assert data[2] == 2 and len(data) < 200  # 版本2，只携带种子
+    restored = shamir.decode_shares(shamir.encode_shares(seeded))
+    assert restored[0][1] == seeded[0][1]
+    assert shamir.reconstruct_secrets(restored[:4]) == secrets
+    assert len(shamir.encode_shares(seeded)) < 0.6 * len(shamir.encode_shares(shamir.split_secrets(secrets)))
+    with pytest.raises(ValueError):
+        decode_share(data[:2] + b"\x01" + data[3:])  # 版本1不允许种子标志
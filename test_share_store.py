@@ -0,0 +1,62 @@
+import pytest
+from secret_sharing import ShamirSecretSharing
+from share_store import ShareStore
+
+
+def test_store_streams_chunks_and_reconstructs(tmp_path):
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus="mersenne61")
+    secrets = list(range(1000, 3500))
+    with ShareStore(str(tmp_path), shamir.element_size, round_id=7) as store:
+        store.split(shamir, secrets, chunk_size=1000)
+        assert len(store) == 2500 and store.parties == [1, 2, 3, 4, 5]
+        sizes = [len(vectors[0][1]) for _, vectors in store.iter_chunks()]
+        assert sizes == [8000, 8000, 4000]  # 每块是份额文件中的定长字节段
+        assert store.reconstruct(shamir, xs=[2, 4, 5]) == secrets
+
+    # 重新打开：索引从磁盘读取
+    with ShareStore(str(tmp_path)) as store:
+        assert store.round_id == 7
+        chunks = list(store.iter_reconstruct(shamir, xs=[1, 3, 5]))
+        assert list(chunks[1][0]) == list(range(1000, 2000))
+        assert chunks[1][1] == secrets[1000:2000]
+
+
+def test_store_keeps_merkle_auth_and_detects_tampering(tmp_path):
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, auth_mode="merkle", modulus="mersenne127")
+    with ShareStore(str(tmp_path), shamir.element_size) as store:
+        store.append(shamir.split_secrets([11, 22, 33]), secret_ids=["a", "b", "c"])
+        (ids, secrets), = store.iter_reconstruct(shamir)
+        assert ids == ["a", "b", "c"] and secrets == [11, 22, 33]
+
+    with open(tmp_path / "party_1.bin", "r+b") as f:
+        f.write(b"\xff")
+    with ShareStore(str(tmp_path)) as store:
+        assert store.reconstruct(shamir, xs=[1, 2, 3, 4]) == [11, 22, 33]  # 篡改的1号被跳过
+        with pytest.raises(ValueError):
+            store.reconstruct(shamir, xs=[1, 2, 3])
+
+
+def test_store_rejects_mismatched_element_size(tmp_path):
+    ShareStore(str(tmp_path), 8).append(ShamirSecretSharing(2, 3, modulus="mersenne61").split_secrets([1]))
+    with pytest.raises(ValueError):
+        ShareStore(str(tmp_path), 16)
+    with pytest.raises(ValueError):
+        ShareStore(str(tmp_path)).reconstruct(ShamirSecretSharing(2, 3, modulus="mersenne127"))
+
+
+def test_store_rejects_seeded_shares_until_expanded(tmp_path):
+    shamir = ShamirSecretSharing(threshold=3, num_parties=5, modulus="mersenne127")
+    seeded = shamir.split_seeded([5, 6, 7])
+    with ShareStore(str(tmp_path), shamir.element_size) as store:
+        with pytest.raises(ValueError, match="expand_share"):
+            store.append(seeded)
+        store.append([shamir.expand_share(share) for share in seeded])
+        assert store.reconstruct(shamir, xs=[1, 2, 5]) == [5, 6, 7]
+
+
+def test_store_accepts_decoded_wire_shares(tmp_path):
+    shamir = ShamirSecretSharing(threshold=2, num_parties=3, modulus="mersenne61")
+    decoded = shamir.decode_shares(shamir.encode_shares(shamir.split_secrets([8, 9, 10])))
+    with ShareStore(str(tmp_path), shamir.element_size) as store:
+        store.append(decoded)
+        assert len(store) == 3 and store.reconstruct(shamir, xs=[1, 3]) == [8, 9, 10]
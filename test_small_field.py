@@ -0,0 +1,64 @@
+import random
+import numpy as np
+import pytest
+import small_field
+from secret_sharing import ShamirSecretSharing
+
+
+@pytest.mark.parametrize("modulus", [257, 2 ** 31 - 1, 2 ** 61 - 1])
+def test_kernels_match_python_ints(modulus):
+    a = [random.randrange(modulus) for _ in range(5000)] + [modulus - 1, 0]
+    b = [random.randrange(modulus) for _ in range(5000)] + [modulus - 1, modulus - 1]
+    va, vb = np.array(a, dtype=np.uint64), np.array(b, dtype=np.uint64)
+    assert small_field.mulmod(va, vb, modulus).tolist() == [x * y % modulus for x, y in zip(a, b)]
+    assert small_field.addmod(va, vb, modulus).tolist() == [(x + y) % modulus for x, y in zip(a, b)]
+    size = (modulus.bit_length() + 7) // 8
+    encoded = small_field.to_bytes(va, size)
+    assert encoded == b"".join(x.to_bytes(size, "big") for x in a)
+    assert small_field.from_bytes(encoded, size).tolist() == a
+
+
+def test_supported_moduli():
+    assert small_field.supports(2 ** 31 - 1) and small_field.supports(2 ** 61 - 1)
+    assert not small_field.supports(2 ** 89 - 1)
+    assert ShamirSecretSharing(3, 5, modulus="mersenne61").small_field
+    assert not ShamirSecretSharing(3, 5).small_field
+
+
+@pytest.mark.parametrize("name", ["gf257", "mersenne31", "mersenne61"])
+def test_small_field_split_and_reconstruct(name):
+    shamir = ShamirSecretSharing(threshold=4, num_parties=7, modulus=name, auth_mode="merkle")
+    secrets = np.array([random.randrange(shamir.modulus) for _ in range(300)], dtype=np.uint64)
+    share_vectors = shamir.split_secrets(secrets)
+    assert isinstance(share_vectors[0][1], np.ndarray)
+    restored = shamir.reconstruct_secrets(share_vectors[3:])
+    assert restored.tolist() == secrets.tolist()
+
+    # 列表输入/输出与大整数路径的份额格式互通
+    as_lists = [(x, ys.tolist(), sig, mac) for x, ys, sig, mac in share_vectors]
+    assert shamir.reconstruct_secrets(as_lists[:4]) == secrets.tolist()
+    assert shamir.reconstruct_secret(shamir.split_secret(int(secrets[0]))[:4]) == secrets[0]
+
+
+def test_small_field_rejects_out_of_range_and_tampering():
+    shamir = ShamirSecretSharing(threshold=2, num_parties=3, modulus="mersenne61")
+    with pytest.raises(ValueError):
+        shamir.split_secrets([shamir.modulus])
+    with pytest.raises(ValueError):
+        shamir.split_secrets(np.array([-1], dtype=np.int64))
+    # 先做范围检查再加噪，越界秘密不会被取模“修正”
+    with pytest.raises(ValueError):
+        shamir.split_secrets([shamir.modulus + 5], epsilon=1.0)
+    with pytest.raises(ValueError):
+        shamir.split_secrets([-1], epsilon=1.0)
+    noisy = shamir.split_secrets(np.array([7], dtype=np.uint64), epsilon=1.0)
+    assert isinstance(noisy[0][1], np.ndarray) and shamir.reconstruct_secrets(noisy[:2]).dtype == np.uint64
+    share_vectors = shamir.split_secrets([1, 2, 3])
+    x, ys, sig, mac = share_vectors[0]
+    tampered = (x, [ys[0] ^ 1] + ys[1:], sig, mac)
+    with pytest.raises(ValueError):
+        shamir.reconstruct_secrets([tampered, share_vectors[1]])
+    # 畸形条目与大整数路径一样被静默跳过
+    assert shamir.reconstruct_secrets([None, (1,), tampered] + share_vectors[1:]) == [1, 2, 3]
+    arrays = shamir.split_secrets(np.array([4, 5], dtype=np.uint64))
+    assert shamir.reconstruct_secrets([None, (1,)] + arrays[:2]).tolist() == [4, 5]